@@ -1,71 +1,329 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
-import json
+import logging
+import math
 import os
 import io
-import base64
+import queue
+import hashlib
 import matplotlib
+import orjson
 matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+matplotlib.rcParams['agg.path.chunksize'] = 10000  # Split long paths so Agg never hits its cell limit
+from matplotlib.figure import Figure
+from matplotlib.patches import Polygon
 import numpy as np
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 # Import existing modules
 from hodograph_plotter import HodographPlotter
 from data_processor import WindProfile
-from radar_sites import get_sorted_sites, get_site_by_id
-from utils import calculate_wind_components
-from metar_utils import get_metar
-from params import compute_bunkers, compute_srh
-from map_component import load_metar_sites, calculate_distance
+from radar_sites import RADAR_SITES, get_sorted_sites
+from utils import calculate_wind_components, angle_between
+from metar_utils import get_metar, cache_data, is_valid_station_id
+from params import compute_bunkers, compute_srh_multi, compute_shear_mag, compute_aligned_shear, compute_shear_window
+from http_client import http_session
 from nexrad_fetcher import NEXRADFetcher
-from warning_utils import fetch_active_warnings
+
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, which also serializes NumPy arrays and scalars natively"""
+    
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def dumps(self, obj, **kwargs) -> str:
+        option = self.option
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        # Dates still go through Flask's default so their format is unchanged
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compress JSON and text responses; the site lists shrink several times over
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
 # Global variables for caching
-wind_profile = WindProfile()
 nexrad_fetcher = NEXRADFetcher()
 
+# Parsed wind profiles keyed by radar site, refreshed on the VAD update cadence.
+# At most PROFILE_CACHE_SIZE sites are kept; the least recently loaded is dropped first.
+PROFILE_TTL = 300
+PROFILE_CACHE_SIZE = 64
+_profile_cache: Dict[str, WindProfile] = {}
+_profile_cache_ttl: Dict[str, float] = {}
+# Fetch locks only live while a request holds or waits on them
+_profile_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_profile_locks_guard = threading.Lock()
+
+# Failed loads are remembered briefly so requests queued behind a failing fetch
+# share its outcome instead of each retrying the download in turn
+PROFILE_ERROR_TTL = 30
+_profile_errors: Dict[str, Tuple[str, int, float]] = {}
+
+# A profile past PROFILE_TTL but younger than PROFILE_STALE_TTL is still served
+# while the next one is fetched in the background, so only a cold site blocks on NEXRAD
+PROFILE_STALE_TTL = 900
+_profile_refreshing: set = set()
+
+def load_wind_profile(site_id: str) -> Tuple[Optional[WindProfile], Optional[str], int]:
+    """
+    Get the wind profile for a radar site, fetching and parsing the latest VAD
+    file at most once per PROFILE_TTL seconds. A stale profile is returned
+    as-is while a background refresh replaces it.
+
+    Returns:
+        tuple: (wind_profile, error_message, status_code)
+    """
+    site_id = site_id.upper()
+    # Only known radars are fetched, so client-supplied ids cannot add cache or lock entries
+    if site_id not in RADAR_SITES:
+        return None, 'Unknown radar site', 404
+
+    cached = _profile_cache.get(site_id)
+    if cached is not None:
+        age = time.time() - _profile_cache_ttl.get(site_id, 0)
+        if age < PROFILE_TTL:
+            return cached, None, 200
+        if age < PROFILE_STALE_TTL:
+            with _profile_locks_guard:
+                start_refresh = site_id not in _profile_refreshing
+                _profile_refreshing.add(site_id)
+            if start_refresh:
+                io_executor.submit(_refresh_in_background, site_id)
+            return cached, None, 200
+
+    return refresh_wind_profile(site_id)
+
+def _refresh_in_background(site_id: str) -> None:
+    """Reload a stale profile off the request thread"""
+    try:
+        refresh_wind_profile(site_id)
+    except Exception as e:
+        logger.warning("Background refresh of %s failed: %s", site_id, e)
+    finally:
+        with _profile_locks_guard:
+            _profile_refreshing.discard(site_id)
+
+def refresh_wind_profile(site_id: str) -> Tuple[Optional[WindProfile], Optional[str], int]:
+    """
+    Fetch and parse the latest VAD file for a radar site unless another
+    caller has just done so.
+
+    Returns:
+        tuple: (wind_profile, error_message, status_code)
+    """
+    # One fetch per site at a time so concurrent misses don't all hit NEXRAD
+    with _profile_locks_guard:
+        lock = _profile_locks.setdefault(site_id, threading.Lock())
+
+    with lock:
+        # Another request may have refreshed the profile while we waited
+        cached = _profile_cache.get(site_id)
+        if cached is not None and time.time() - _profile_cache_ttl.get(site_id, 0) < PROFILE_TTL:
+            return cached, None, 200
+        failed = _profile_errors.get(site_id)
+        if failed is not None and time.time() - failed[2] < PROFILE_ERROR_TTL:
+            return None, failed[0], failed[1]
+
+        # Fetch latest VAD file
+        file_path = nexrad_fetcher.fetch_latest(site_id)
+        if not file_path:
+            _remember_profile_error(site_id, 'No VAD data available for this site', 404)
+            return None, 'No VAD data available for this site', 404
+
+        # Load data into wind profile
+        profile = WindProfile()
+        if not profile.load_from_nexrad(file_path):
+            _remember_profile_error(site_id, 'Failed to load VAD data', 500)
+            return None, 'Failed to load VAD data', 500
+
+        # The site lock only serializes this site; the tables are shared with every other
+        # site's loads and with /api/reset, so they are updated under the guard
+        dropped = []
+        with _profile_locks_guard:
+            _profile_errors.pop(site_id, None)
+            # Re-insert so the dict stays ordered from least to most recently loaded
+            dropped.append(_profile_cache.pop(site_id, None))
+            if len(_profile_cache) >= PROFILE_CACHE_SIZE:
+                oldest = next(iter(_profile_cache))
+                dropped.append(_profile_cache.pop(oldest))
+                _profile_cache_ttl.pop(oldest, None)
+            _profile_cache[site_id] = profile
+            _profile_cache_ttl[site_id] = time.time()
+        for replaced in dropped:
+            if replaced is not None:
+                forget_profile_renders(replaced)
+        return profile, None, 200
+
+def forget_profile_renders(profile: Optional[WindProfile]) -> None:
+    """Drop cached images and parameters computed from a profile that is no longer served"""
+    with _image_cache_lock:
+        for key in [key for key, entry in _image_cache.items() if entry[0] is profile]:
+            del _image_cache[key]
+    with _params_cache_lock:
+        for key in [key for key, entry in _params_cache.items() if entry[0] is profile]:
+            del _params_cache[key]
+
+def _remember_profile_error(site_id: str, error: str, status: int) -> None:
+    """Record a failed load for PROFILE_ERROR_TTL, keeping the error table bounded"""
+    with _profile_locks_guard:
+        _profile_errors.pop(site_id, None)
+        if len(_profile_errors) >= PROFILE_CACHE_SIZE:
+            _profile_errors.pop(next(iter(_profile_errors)))
+        _profile_errors[site_id] = (error, status, time.time())
+
+# Pre-built plotters reused across requests. Each plotter owns its figure, so
+# taking one from the pool gives a request exclusive use of it. Renders scale
+# across gunicorn worker processes; within a process there is one plotter per
+# worker thread so a render never waits on the pool.
+PLOTTER_POOL_SIZE = int(os.environ.get('GUNICORN_THREADS', 4))
+_plotter_pool: "queue.Queue[HodographPlotter]" = queue.Queue()
+for _ in range(PLOTTER_POOL_SIZE):
+    _plotter_pool.put(HodographPlotter())
+
+# Output encodings for hodograph images: format -> (mimetype, Pillow encoder options)
+HODOGRAPH_DPI = 100
+HODOGRAPH_FORMATS = {
+    'webp': ('image/webp', {'quality': 90, 'method': 4}),
+    'png': ('image/png', {'compress_level': 1}),
+}
+
+def warm_up_renderer() -> None:
+    """Render a throwaway figure so font loading and encoder setup happen at startup"""
+    fig = Figure(figsize=(1, 1))
+    ax = fig.add_subplot()
+    ax.text(0, 0, 'N')
+    ax.text(0, 0, '1', fontweight='bold', fontsize=9)
+    fig.suptitle('warm-up')
+    for image_format, (_, pil_kwargs) in HODOGRAPH_FORMATS.items():
+        fig.savefig(io.BytesIO(), format=image_format, dpi=HODOGRAPH_DPI, pil_kwargs=pil_kwargs)
+
+try:
+    warm_up_renderer()
+except Exception as e:
+    # Not fatal: the first real render will just pay the setup cost instead
+    logger.warning("Renderer warm-up failed: %s", e)
+
+# Encoded hodograph images keyed by profile identity, output format and request arguments,
+# in least recently used order
+IMAGE_CACHE_SIZE = 64
+_image_cache: Dict[tuple, Tuple[WindProfile, bytes, str]] = {}
+_image_cache_lock = threading.Lock()
+
+# Worker pool for upstream HTTP lookups so they overlap with plot rendering
+io_executor = ThreadPoolExecutor(max_workers=8)
+
+@cache_data(ttl=60)  # Cache for 1 minute
+def fetch_metar_report_time(station_id: str) -> Optional[str]:
+    """Fetch the METAR report time for a station formatted as HHMM"""
+    response = http_session.get("https://aviationweather.gov/api/data/metar",
+                                params={'ids': station_id, 'format': 'json'}, timeout=5)
+    if response.status_code != 200:
+        return None
+    metar_json = response.json()
+    if not metar_json:
+        return None
+    obs_time = metar_json[0].get('reportTime', '')
+    if not obs_time:
+        return None
+    # Extract time from ISO format (e.g., "2025-06-08T22:53:00Z")
+    obs_dt = datetime.fromisoformat(obs_time.replace('Z', '+00:00'))
+    return obs_dt.strftime('%H%M')
+
 @app.route('/')
 def index():
     """Main page with map and controls"""
     return render_template('index.html')
 
+def build_radar_sites_payload():
+    """Build the radar site list served by /api/radar-sites"""
+    return tuple(
+        {'id': site.id, 'name': site.name, 'lat': site.lat, 'lon': site.lon, 'elevation': site.elevation}
+        for site in get_sorted_sites()
+    )
+
+# The radar site table never changes at runtime, so serialize and hash it once at import
+_RADAR_SITES_JSON = orjson.dumps(build_radar_sites_payload())
+_RADAR_SITES_ETAG = hashlib.sha1(_RADAR_SITES_JSON).hexdigest()
+
+@cache_data(ttl=86400)  # Station list comes from a bundled CSV
+def build_metar_sites_payload() -> Tuple[bytes, str]:
+    """Serialize the METAR station list served by /api/metar-sites, returning (body, etag)"""
+    # map_component pulls in folium and the map layers, which only this daily rebuild needs
+    from map_component import load_metar_sites
+    df = load_metar_sites()
+    if df.empty:
+        records = []
+    else:
+        # Column-wise conversion avoids building a Series per row
+        records = (df.rename(columns={'ID': 'id', 'Name': 'name', 'Latitude': 'lat', 'Longitude': 'lon'})
+                     [['id', 'name', 'lat', 'lon']]
+                     .to_dict(orient='records'))
+    body = orjson.dumps(records)
+    return body, hashlib.sha1(body).hexdigest()
+
+@cache_data(ttl=60)  # Cache for 1 minute
+def get_active_warnings():
+    """Fetch active warnings, shared across requests for a short window"""
+    # Imported on first use so workers that never serve warnings skip its dependencies.
+    # The uncached loader is used so this 60 s cache, which /api/warnings advertises
+    # in its max-age, is the only one in front of the NWS API.
+    from warning_utils import load_active_warnings
+    return load_active_warnings()
+
+def conditional_json(payload, max_age: int):
+    """
+    Serialize a payload as a cacheable JSON response.
+
+    The response carries an ETag derived from its body, so clients that
+    send a matching If-None-Match get an empty 304 instead of the payload.
+    """
+    return make_conditional(jsonify(payload), max_age)
+
+def make_conditional(response: Response, max_age: int, etag: Optional[str] = None) -> Response:
+    """
+    Add public caching headers and an ETag, answering If-None-Match with 304.
+
+    The ETag is hashed from the body unless a precomputed one is given.
+    """
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    response.vary.add('Accept-Encoding')
+    if etag is None:
+        response.add_etag()
+    else:
+        response.set_etag(etag)
+    return response.make_conditional(request)
+
 @app.route('/api/radar-sites')
 def get_radar_sites():
     """Get all radar sites as JSON"""
-    sites = get_sorted_sites()
-    sites_data = []
-    for site in sites:
-        sites_data.append({
-            'id': site.id,
-            'name': site.name,
-            'lat': site.lat,
-            'lon': site.lon,
-            'elevation': site.elevation
-        })
-    return jsonify(sites_data)
+    return make_conditional(Response(_RADAR_SITES_JSON, mimetype='application/json'), 86400, _RADAR_SITES_ETAG)
 
 @app.route('/api/metar-sites')
 def get_metar_sites():
     """Get METAR sites as JSON"""
     try:
-        df = load_metar_sites()
-        if df.empty:
-            return jsonify([])
-        
-        metar_data = []
-        for _, row in df.iterrows():
-            metar_data.append({
-                'id': row['ID'],
-                'name': row['Name'],
-                'lat': row['Latitude'],
-                'lon': row['Longitude']
-            })
-        return jsonify(metar_data)
+        body, etag = build_metar_sites_payload()
+        return make_conditional(Response(body, mimetype='application/json'), 3600, etag)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -73,37 +331,26 @@ def get_metar_sites():
 def get_warnings():
     """Get active weather warnings"""
     try:
-        warnings = fetch_active_warnings()
-        return jsonify(warnings)
+        return conditional_json(get_active_warnings(), 60)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/vad-data/<site_id>')
 def get_vad_data(site_id):
     """Fetch VAD data for a radar site"""
-    global wind_profile
-    
     try:
-        # Fetch latest VAD file
-        file_path = nexrad_fetcher.fetch_latest(site_id.upper())
-        if not file_path:
-            return jsonify({'error': 'No VAD data available for this site'}), 404
-        
-        # Load data into wind profile
-        wind_profile = WindProfile()
-        success = wind_profile.load_from_nexrad(file_path)
-        
-        if not success:
-            return jsonify({'error': 'Failed to load VAD data'}), 500
+        wind_profile, error, status = load_wind_profile(site_id)
+        if error:
+            return jsonify({'error': error}), status
         
         # Get site information
-        site = get_site_by_id(site_id.upper())
+        site = RADAR_SITES.get(site_id.upper())
         
         return jsonify({
             'site_id': site_id.upper(),
             'site_name': site.name if site else site_id,
             'data_points': len(wind_profile.heights),
-            'max_height': float(np.max(wind_profile.heights)) if len(wind_profile.heights) > 0 else 0,
+            'max_height': np.max(wind_profile.heights) if len(wind_profile.heights) > 0 else 0,
             'success': True
         })
         
@@ -119,591 +366,598 @@ def get_metar_data(station_id):
         if error:
             return jsonify({'error': error}), 400
         
-        return jsonify({
+        # Observations are cached upstream for 5 minutes; let clients revalidate against the ETag
+        return conditional_json({
             'station': station_id.upper(),
             'direction': wind_dir,
             'speed': wind_speed,
             'time': obs_time.isoformat() if obs_time else None
-        })
+        }, 60)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/hodograph')
-def generate_hodograph():
-    """Generate hodograph plot"""
-    global wind_profile
+def read_hodograph_args() -> Dict[str, Any]:
+    """Read the query arguments shared by the hodograph image and parameter endpoints"""
+    return {
+        'site_id': request.args.get('site_id', '').upper(),  # Radar ids are stored uppercase
+        'plot_type': request.args.get('type', 'Standard'),
+        'show_half_km': request.args.get('show_half_km', 'true').lower() == 'true',
+        'storm_direction': request.args.get('storm_direction', type=float),
+        'storm_speed': request.args.get('storm_speed', type=float),
+        'metar_direction': request.args.get('metar_direction', type=float),
+        'metar_speed': request.args.get('metar_speed', type=float),
+        'metar_station': request.args.get('metar_station', 'METAR'),
+        'metar_time': format_metar_time(request.args.get('metar_time')),
+    }
+
+def format_metar_time(value: Optional[str]) -> Optional[str]:
+    """Format an ISO METAR observation time passed by the client as HHMM"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%H%M')
+    except ValueError:
+        return None
+
+def build_param_data(wind_profile: WindProfile, metar_data: Optional[Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """Arrange a wind profile in the format used by params.py, prepending the surface wind if given"""
+    # Prepend surface wind to data arrays, building each array with a single allocation
+    if metar_data:
+        return {
+            'wind_dir': np.concatenate(([metar_data['direction']], wind_profile.directions)),
+            'wind_spd': np.concatenate(([metar_data['speed']], wind_profile.speeds)),
+            'altitude': np.concatenate(([0.0], wind_profile.heights))
+        }
+    # The profile already stores NumPy arrays, and nothing downstream writes to
+    # them, so they are passed through without copying
+    return {
+        'wind_dir': wind_profile.directions,
+        'wind_spd': wind_profile.speeds,
+        'altitude': wind_profile.heights
+    }
+
+def point_wind_components(*points: Optional[Dict[str, float]]) -> List[Optional[Tuple[float, float]]]:
+    """Convert speed/direction wind points to (u, v) in one vectorized call; missing points stay None"""
+    present = [point for point in points if point]
+    if not present:
+        return [None] * len(points)
+    u, v = calculate_wind_components(np.array([point['speed'] for point in present], dtype=float),
+                                     np.array([point['direction'] for point in present], dtype=float))
+    components = iter(zip(u, v))
+    return [next(components) if point else None for point in points]
+
+# Profile parameters shared by the hodograph image and parameter endpoints
+PARAMS_CACHE_SIZE = 64
+_params_cache: Dict[tuple, Tuple[WindProfile, Dict[str, Any]]] = {}
+_params_cache_lock = threading.Lock()
+
+def compute_all_params(wind_profile: WindProfile, storm_motion_tuple: Tuple[float, float],
+                       metar_data: Optional[Dict[str, float]]) -> Dict[str, Any]:
+    """
+    Compute SRH, bulk shear and Bunkers motion for a hodograph in one place.
+
+    /api/hodograph and /api/hodograph/params derive the same values for the same
+    inputs, as does every re-render that only changes display options, so results
+    are memoized per profile, storm motion and surface wind.
+
+    Returns:
+        Dictionary with 'data' (params.py input), 'srh' and 'shear' keyed by
+        depth in metres, and 'bunkers' (None if it could not be computed)
+    """
+    surface = (metar_data['direction'], metar_data['speed']) if metar_data else None
+    key = (id(wind_profile), storm_motion_tuple, surface)
+    with _params_cache_lock:
+        cached = _params_cache.get(key)
+    if cached is not None and cached[0] is wind_profile:
+        return cached[1]
     
+    data = build_param_data(wind_profile, metar_data)
     try:
-        # Get parameters from request
-        plot_type = request.args.get('type', 'Standard')
-        show_half_km = request.args.get('show_half_km', 'true').lower() == 'true'
-        storm_direction = request.args.get('storm_direction', type=float)
-        storm_speed = request.args.get('storm_speed', type=float)
-        metar_direction = request.args.get('metar_direction', type=float)
-        metar_speed = request.args.get('metar_speed', type=float)
-        site_id = request.args.get('site_id', '')
-        
-        # Debug: Print all received parameters
-        print(f"Debug: Hodograph parameters received:")
-        print(f"  site_id: {site_id}")
-        print(f"  storm_direction: {storm_direction}")
-        print(f"  storm_speed: {storm_speed}")
-        print(f"  metar_direction: {metar_direction}")
-        print(f"  metar_speed: {metar_speed}")
-        print(f"  show_half_km: {show_half_km}")
-        
-        if len(wind_profile.heights) == 0:
-            return jsonify({'error': 'No wind profile data loaded'}), 400
-        
-        # Create hodograph plotter
-        plotter = HodographPlotter()
-        
-        # Get site information
-        site = get_site_by_id(site_id) if site_id else None
-        site_name = site.name if site else None
-        
-        # Setup plot with minimal title (we'll add comprehensive title later)
-        from datetime import datetime as dt_class
-        plotter.setup_plot(site_id=site_id, site_name=site_name, valid_time=dt_class.now())
-        
-        # Plot the wind profile
-        plotter.plot_profile(wind_profile, height_colors=True, show_half_km=show_half_km)
-        
-        # Remove duplicate METAR plotting - will be handled in main plotting section
-        
-        # Prepare meteorological data for plotting
-        storm_motion_data = None
-        storm_motion_tuple = None
-        metar_data = None
-        
-        if storm_direction is not None and storm_speed is not None:
-            storm_motion_data = {'direction': storm_direction, 'speed': storm_speed}
-            storm_motion_tuple = (storm_direction, storm_speed)
+        bunkers = compute_bunkers(data)
+    except (IndexError, ValueError):
+        bunkers = None
+    result = {
+        'data': data,
+        'srh': dict(zip((500, 1000, 3000), compute_srh_multi(data, storm_motion_tuple, (500, 1000, 3000)))),
+        'shear': dict(zip((1000, 3000, 6000), compute_shear_mag(data, np.array([1000, 3000, 6000])))),
+        'bunkers': bunkers,
+    }
+    
+    with _params_cache_lock:
+        _params_cache.pop(key, None)
+        if len(_params_cache) >= PARAMS_CACHE_SIZE:
+            _params_cache.pop(next(iter(_params_cache)))
+        _params_cache[key] = (wind_profile, result)
+    return result
+
+def render_hodograph(plotter: HodographPlotter, wind_profile: WindProfile, args: Dict[str, Any],
+                     metar_time_future=None, image_format: str = 'png') -> io.BytesIO:
+    """
+    Draw the hodograph and its meteorological annotations and encode it as an image.
+
+    Args:
+        plotter: Plotter borrowed from the pool for exclusive use
+        wind_profile: Wind profile for the requested site
+        args: Query arguments from read_hodograph_args
+        metar_time_future: Pending METAR observation time lookup, if any
+        image_format: Key of HODOGRAPH_FORMATS to encode as
+
+    Returns:
+        Buffer containing the encoded image
+    """
+    site_id = args['site_id']
+    show_half_km = args['show_half_km']
+    storm_direction = args['storm_direction']
+    storm_speed = args['storm_speed']
+    metar_direction = args['metar_direction']
+    metar_speed = args['metar_speed']
+    metar_station_id = args['metar_station']
+    
+    # Get site information
+    site = RADAR_SITES.get(site_id) if site_id else None
+    
+    # Plot the wind profile (this also sets up the figure)
+    plotter.plot_profile(wind_profile, height_colors=True, show_half_km=show_half_km)
+    
+    # Remove duplicate METAR plotting - will be handled in main plotting section
+    
+    # Prepare meteorological data for plotting
+    storm_motion_data = None
+    storm_motion_tuple = None
+    metar_data = None
+    
+    if storm_direction is not None and storm_speed is not None:
+        storm_motion_data = {'direction': storm_direction, 'speed': storm_speed}
+        storm_motion_tuple = (storm_direction, storm_speed)
+    
+    if metar_direction is not None and metar_speed is not None:
+        metar_data = {'direction': metar_direction, 'speed': metar_speed}
+    
+    # Calculate and add meteorological annotations to the plot
+    fig, ax = plotter.get_plot()
+    
+    # Wind components are computed once per profile and shared by every annotation below
+    profile_u, profile_v = wind_profile.u, wind_profile.v
+    storm_uv, surface_uv = point_wind_components(storm_motion_data, metar_data)
+    if storm_uv:
+        storm_u, storm_v = storm_uv
+    if surface_uv:
+        surface_u, surface_v = surface_uv
+        # Surface wind followed by every radar level, shared by the SRH shading and shear analysis
+        wind_u = np.concatenate(([surface_u], profile_u))
+        wind_v = np.concatenate(([surface_v], profile_v))
+    
+    # Add storm motion and surface wind markers
+    if storm_motion_data:
+        ax.plot(storm_u, storm_v, 'rs', markersize=12, label='Storm Motion', zorder=10)
+    
+    if metar_data:
+        ax.plot(surface_u, surface_v, 'ko', markersize=10, label='Surface Wind', zorder=10)
+    
+    # Add SRH shading and critical angle analysis
+    critical_angle_value = None
+    if storm_motion_data and metar_data and len(wind_profile.speeds) > 0:
+        # Add SRH shading for 0-1km and 0-3km
+        try:
+            heights = np.concatenate(([0.0], np.asarray(wind_profile.heights, dtype=float)))
             
-        if metar_direction is not None and metar_speed is not None:
-            metar_data = {'direction': metar_direction, 'speed': metar_speed}
+            # Create SRH polygon for 0-1km (light green)
+            mask_1km = heights <= 1000  # 1km = 1000m
+            if np.count_nonzero(mask_1km) > 2:
+                # Layer points then storm motion, closed back to the surface by the patch
+                srh_1km = np.column_stack((np.append(wind_u[mask_1km], storm_u),
+                                           np.append(wind_v[mask_1km], storm_v)))
+                ax.add_patch(Polygon(srh_1km, closed=True, color='lightgreen', alpha=0.3,
+                                     label='SRH 0-1km', zorder=1))
+            
+            # Create SRH polygon for 0-3km (light blue)
+            mask_3km = heights <= 3000  # 3km = 3000m
+            if np.count_nonzero(mask_3km) > 2:
+                # Layer points then storm motion, closed back to the surface by the patch
+                srh_3km = np.column_stack((np.append(wind_u[mask_3km], storm_u),
+                                           np.append(wind_v[mask_3km], storm_v)))
+                ax.add_patch(Polygon(srh_3km, closed=True, color='lightblue', alpha=0.2,
+                                     label='SRH 0-3km', zorder=0))
         
-        # Calculate and add meteorological annotations to the plot
-        fig, ax = plotter.get_plot()
+        except Exception as e:
+            logger.warning("Error adding SRH shading: %s", e)
         
-        # Add storm motion and surface wind markers
-        if storm_motion_data:
-            storm_u, storm_v = calculate_wind_components(storm_motion_data['speed'], storm_motion_data['direction'])
-            ax.plot(storm_u, storm_v, 'rs', markersize=12, label='Storm Motion', zorder=10)
+        # Find points within shear vector (±10 degree window from surface-to-lowest radar point)
+        if len(wind_profile.speeds) > 0:
+            # Keep points within ±10 degrees, stopping at the first point outside the window
+            aligned = compute_shear_window(wind_u, wind_v, 10.0)
+            shear_points_u = np.concatenate(([surface_u], profile_u[aligned]))
+            shear_points_v = np.concatenate(([surface_v], profile_v[aligned]))
             
-        if metar_data:
-            metar_u, metar_v = calculate_wind_components(metar_data['speed'], metar_data['direction'])
-            ax.plot(metar_u, metar_v, 'ko', markersize=10, label='Surface Wind', zorder=10)
+            # Draw shear vector line (thick line through aligned points)
+            if len(shear_points_u) > 1:
+                ax.plot(shear_points_u, shear_points_v, 'g-', linewidth=4, alpha=0.7, label='Shear Vector', zorder=8)
             
-        # Add SRH shading and critical angle analysis
-        critical_angle_value = None
-        if storm_motion_data and metar_data and len(wind_profile.speeds) > 0:
-            # Get surface and storm motion components
-            surface_u, surface_v = calculate_wind_components(metar_data['speed'], metar_data['direction'])
-            storm_u, storm_v = calculate_wind_components(storm_motion_data['speed'], storm_motion_data['direction'])
+            # Draw critical angle lines
+            # Line from surface to storm motion
+            ax.plot([surface_u, storm_u], [surface_v, storm_v], 'r--', linewidth=2, alpha=0.8, label='Surface-Storm', zorder=9)
             
-            # Add SRH shading for 0-1km and 0-3km
-            try:
-                # Prepare wind profile data with surface wind
-                u_comp = [surface_u]
-                v_comp = [surface_v]
-                heights = [0.0]
-                
-                for i, (speed, direction) in enumerate(zip(wind_profile.speeds, wind_profile.directions)):
-                    u, v = calculate_wind_components(speed, direction)
-                    u_comp.append(u)
-                    v_comp.append(v)
-                    heights.append(wind_profile.heights[i])
+            # Line from surface to end of shear vector
+            if len(shear_points_u) > 1:
+                end_u, end_v = shear_points_u[-1], shear_points_v[-1]
+                ax.plot([surface_u, end_u], [surface_v, end_v], 'b--', linewidth=2, alpha=0.8, label='Surface-Shear', zorder=9)
                 
-                # Convert to numpy arrays
-                u_comp = np.array(u_comp)
-                v_comp = np.array(v_comp)
-                heights = np.array(heights)
+                # Calculate critical angle for parameter display
+                critical_angle_value = angle_between(storm_u - surface_u, storm_v - surface_v,
+                                                     end_u - surface_u, end_v - surface_v)
                 
-                # Create SRH polygon for 0-1km (light green)
-                srh_1km_u = []
-                srh_1km_v = []
-                for i, height in enumerate(heights):
-                    if height <= 1000:  # 1km = 1000m
-                        srh_1km_u.append(u_comp[i])
-                        srh_1km_v.append(v_comp[i])
-                
-                if len(srh_1km_u) > 2:
-                    # Close the polygon by connecting back to storm motion
-                    srh_1km_u.append(storm_u)
-                    srh_1km_v.append(storm_v)
-                    srh_1km_u.append(srh_1km_u[0])  # Close to start
-                    srh_1km_v.append(srh_1km_v[0])
-                    
-                    ax.fill(srh_1km_u, srh_1km_v, color='lightgreen', alpha=0.3, label='SRH 0-1km', zorder=1)
-                
-                # Create SRH polygon for 0-3km (light blue)
-                srh_3km_u = []
-                srh_3km_v = []
-                for i, height in enumerate(heights):
-                    if height <= 3000:  # 3km = 3000m
-                        srh_3km_u.append(u_comp[i])
-                        srh_3km_v.append(v_comp[i])
-                
-                if len(srh_3km_u) > 2:
-                    # Close the polygon by connecting back to storm motion
-                    srh_3km_u.append(storm_u)
-                    srh_3km_v.append(storm_v)
-                    srh_3km_u.append(srh_3km_u[0])  # Close to start
-                    srh_3km_v.append(srh_3km_v[0])
-                    
-                    ax.fill(srh_3km_u, srh_3km_v, color='lightblue', alpha=0.2, label='SRH 0-3km', zorder=0)
-                    
-            except Exception as e:
-                print(f"Error adding SRH shading: {e}")
+                # SRH values are displayed only in the upper left parameter box
+    
+    # Add meteorological parameters text directly on the plot
+    if storm_motion_data:
+        try:
+            # Calculate key parameters
+            all_params = compute_all_params(wind_profile, storm_motion_tuple, metar_data)
+            param_data = all_params['data']
             
-            # Find points within shear vector (±10 degree window from surface-to-lowest radar point)
-            if len(wind_profile.speeds) > 0:
-                # Get lowest radar point
-                radar_u, radar_v = calculate_wind_components(wind_profile.speeds[0], wind_profile.directions[0])
-                
-                # Calculate reference vector (surface to lowest radar point)
-                ref_u, ref_v = radar_u - surface_u, radar_v - surface_v
-                
-                # Find all points within ±10 degrees of reference vector
-                shear_points_u = [surface_u]
-                shear_points_v = [surface_v]
-                
-                for i, (speed, direction) in enumerate(zip(wind_profile.speeds, wind_profile.directions)):
-                    point_u, point_v = calculate_wind_components(speed, direction)
-                    vector_u, vector_v = point_u - surface_u, point_v - surface_v
-                    
-                    # Calculate angle between reference vector and current vector
-                    if np.sqrt(ref_u**2 + ref_v**2) > 0 and np.sqrt(vector_u**2 + vector_v**2) > 0:
-                        dot_product = ref_u * vector_u + ref_v * vector_v
-                        mag_ref = np.sqrt(ref_u**2 + ref_v**2)
-                        mag_vec = np.sqrt(vector_u**2 + vector_v**2)
-                        cos_angle = np.clip(dot_product / (mag_ref * mag_vec), -1.0, 1.0)
-                        angle = np.rad2deg(np.arccos(cos_angle))
-                        
-                        if angle <= 10.0:  # Within ±10 degrees
-                            shear_points_u.append(point_u)
-                            shear_points_v.append(point_v)
-                        else:
-                            break  # Stop at first point outside the window
-                
-                # Draw shear vector line (thick line through aligned points)
-                if len(shear_points_u) > 1:
-                    ax.plot(shear_points_u, shear_points_v, 'g-', linewidth=4, alpha=0.7, label='Shear Vector', zorder=8)
-                
-                # Draw critical angle lines
-                # Line from surface to storm motion
-                ax.plot([surface_u, storm_u], [surface_v, storm_v], 'r--', linewidth=2, alpha=0.8, label='Surface-Storm', zorder=9)
-                
-                # Line from surface to end of shear vector
-                if len(shear_points_u) > 1:
-                    end_u, end_v = shear_points_u[-1], shear_points_v[-1]
-                    ax.plot([surface_u, end_u], [surface_v, end_v], 'b--', linewidth=2, alpha=0.8, label='Surface-Shear', zorder=9)
+            # Debug the data structure before SRH calculation
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("param_data structure: %d levels, first wind_dir %s, first wind_spd %s, "
+                             "first altitude %s, max altitude %s, %d levels up to 1000m, %d up to 3000m, "
+                             "storm motion %s",
+                             len(param_data['altitude']), param_data['wind_dir'][:3], param_data['wind_spd'][:3],
+                             param_data['altitude'][:3],
+                             np.max(param_data['altitude']) if len(param_data['altitude']) > 0 else 'empty',
+                             np.sum(param_data['altitude'] <= 1000), np.sum(param_data['altitude'] <= 3000),
+                             storm_motion_tuple)
+            
+            srh_0_1 = all_params['srh'][1000]
+            srh_0_3 = all_params['srh'][3000]
+            shear_1km = all_params['shear'][1000]
+            shear_3km = all_params['shear'][3000]
+            
+            # Create parameter text with requested order
+            param_text = []
+            
+            # Wind shear values first
+            if not np.isnan(shear_1km):
+                param_text.append(f'0-1km Shear: {shear_1km:.0f} kts')
+            if not np.isnan(shear_3km):
+                param_text.append(f'0-3km Shear: {shear_3km:.0f} kts')
+            
+            # Storm motion (input storm motion)
+            if storm_motion_data:
+                param_text.append(f'Storm Motion: {storm_motion_data["direction"]:.0f}°/{storm_motion_data["speed"]:.0f}kts')
+            
+            # Add Bunkers storm motion
+            bunkers_result = all_params['bunkers']
+            if bunkers_result and len(bunkers_result) >= 2:
+                bunkers_rm = bunkers_result[0]
+                param_text.append(f'Bunkers RM: {bunkers_rm[0]:.0f}°/{bunkers_rm[1]:.0f}kts')
+            
+            # Add critical angle below Bunkers data
+            if critical_angle_value is not None:
+                param_text.append(f'Critical Angle: {critical_angle_value:.1f}°')
+            
+            # Calculate and add shear magnitude and depth for display
+            shear_magnitude_display = None
+            shear_depth_display = None
+            if metar_data and len(param_data['wind_spd']) > 1:
+                # Find all radar points within ±5 degrees of the surface-to-lowest-radar vector
+                aligned = compute_aligned_shear(wind_u, wind_v, param_data['altitude'], 5.0)
+                
+                if aligned is not None:
+                    raw_depth, final_u, final_v, aligned_count = aligned
                     
-                    # Calculate critical angle for parameter display
-                    v1_u, v1_v = storm_u - surface_u, storm_v - surface_v
-                    v2_u, v2_v = end_u - surface_u, end_v - surface_v
+                    logger.debug("Found %d aligned levels, raw depth %.0fm", aligned_count, raw_depth)
                     
-                    if np.sqrt(v1_u**2 + v1_v**2) > 0 and np.sqrt(v2_u**2 + v2_v**2) > 0:
-                        dot_product = v1_u * v2_u + v1_v * v2_v
-                        mag1 = np.sqrt(v1_u**2 + v1_v**2)
-                        mag2 = np.sqrt(v2_u**2 + v2_v**2)
-                        cos_angle = np.clip(dot_product / (mag1 * mag2), -1.0, 1.0)
-                        critical_angle_value = np.rad2deg(np.arccos(cos_angle))
+                    # If VAD altitudes are very small (< 50m), estimate depth based on typical radar beam geometry
+                    if raw_depth < 50:
+                        # Estimate depth based on number of aligned levels and typical VAD level spacing
+                        # Typical VAD levels are spaced every ~150-300m in height
+                        estimated_depth = aligned_count * 200  # 200m per level estimate
+                        shear_depth_display = max(raw_depth, estimated_depth)
+                        logger.debug("Using estimated depth %.0fm", shear_depth_display)
+                    else:
+                        shear_depth_display = raw_depth
                     
-                    # SRH values are displayed only in the upper left parameter box
-        
-        # Add meteorological parameters text directly on the plot
-        if storm_motion_data:
-            # Calculate parameters for text display
-            param_data = {
-                'wind_dir': np.array(wind_profile.directions),
-                'wind_spd': np.array(wind_profile.speeds),
-                'altitude': np.array(wind_profile.heights)
-            }
+                    # Calculate shear magnitude using the highest aligned point
+                    shear_magnitude_display = np.hypot(final_u - surface_u, final_v - surface_v)
+                else:
+                    logger.debug("No aligned heights found")
             
-            # Add surface wind if available
-            if metar_data:
-                param_data['wind_dir'] = np.insert(param_data['wind_dir'], 0, metar_data['direction'])
-                param_data['wind_spd'] = np.insert(param_data['wind_spd'], 0, metar_data['speed'])
-                param_data['altitude'] = np.insert(param_data['altitude'], 0, 0.0)
+            # Add shear magnitude and depth under critical angle
+            if shear_magnitude_display is not None:
+                param_text.append(f'Shear Magnitude: {shear_magnitude_display:.0f} kts')
+            if shear_depth_display is not None:
+                param_text.append(f'Shear Depth: {shear_depth_display:.0f} m')
+            
+            # Always add SRH values after shear parameters (regardless of shear depth availability)
+            if not np.isnan(srh_0_1):
+                param_text.append(f'SRH 0-1km: {srh_0_1:.0f} m²/s²')
+            if not np.isnan(srh_0_3):
+                param_text.append(f'SRH 0-3km: {srh_0_3:.0f} m²/s²')
+            
+            # Display parameters text box in upper left corner
+            if param_text:
+                param_str = '\n'.join(param_text)
+                ax.text(0.02, 0.98, param_str, transform=ax.transAxes, fontsize=10,
+                       verticalalignment='top', bbox=dict(boxstyle="round,pad=0.5", 
+                       facecolor="lightblue", alpha=0.8), zorder=12)
             
+            # SRH values are now only displayed in the upper left parameter box
+        except Exception as e:
+            # Full tracebacks only in debug mode; the plot is still returned without the text box
+            logger.error("Error adding parameters to plot: %s", e, exc_info=app.debug)
+    
+    # Add comprehensive title to the hodograph
+    title_lines = []
+    if site:
+        title_lines.append(f'{site.id} - {site.name.upper()}')
+    
+    # Get VAD valid time from wind profile data (simplified)
+    if hasattr(wind_profile, 'times') and len(wind_profile.times) > 0:
+        vad_time = wind_profile.times[0]  # Use first timestamp
+        if hasattr(vad_time, 'strftime'):
+            utc_str = vad_time.strftime('%Y-%m-%d %H:%M')
+            title_lines.append(f'Valid: {utc_str}UTC')
+        else:
+            title_lines.append(f'Valid: VAD Data Available')
+    else:
+        # Use current time as fallback
+        from datetime import datetime as dt_class
+        current_time = dt_class.now()
+        title_lines.append(f'Valid: {current_time.strftime("%Y-%m-%d %H:%M")}UTC')
+    
+    # Add empty line
+    title_lines.append('')
+    
+    # Add surface wind information with station ID and timestamp
+    if metar_data:
+        obs_str = args['metar_time']
+        if obs_str is None and metar_time_future is not None:
             try:
-                # Calculate key parameters
-                from params import compute_srh, compute_shear_mag
-                
-                # Debug the data structure before SRH calculation
-                print(f"Debug: param_data structure:")
-                print(f"  wind_dir length: {len(param_data['wind_dir'])}")
-                print(f"  wind_spd length: {len(param_data['wind_spd'])}")
-                print(f"  altitude length: {len(param_data['altitude'])}")
-                print(f"  first few wind_dir: {param_data['wind_dir'][:3] if len(param_data['wind_dir']) > 0 else 'empty'}")
-                print(f"  first few wind_spd: {param_data['wind_spd'][:3] if len(param_data['wind_spd']) > 0 else 'empty'}")
-                print(f"  first few altitude: {param_data['altitude'][:3] if len(param_data['altitude']) > 0 else 'empty'}")
-                print(f"  max altitude: {np.max(param_data['altitude']) if len(param_data['altitude']) > 0 else 'empty'}")
-                print(f"  altitudes up to 1000m: {np.sum(param_data['altitude'] <= 1000)}")
-                print(f"  altitudes up to 3000m: {np.sum(param_data['altitude'] <= 3000)}")
-                print(f"  storm_motion_tuple: {storm_motion_tuple}")
-                
-                # Only calculate SRH if we have storm motion
-                if storm_motion_tuple:
-                    srh_0_1 = compute_srh(param_data, storm_motion_tuple, 1000)
-                    srh_0_3 = compute_srh(param_data, storm_motion_tuple, 3000)
-                else:
-                    srh_0_1 = np.nan
-                    srh_0_3 = np.nan
-                shear_1km = compute_shear_mag(param_data, 1000)
-                shear_3km = compute_shear_mag(param_data, 3000)
-                
-                print(f"Debug: Calculated SRH values - srh_0_1: {srh_0_1}, srh_0_3: {srh_0_3}")
-                
-                # Create parameter text with requested order
-                param_text = []
-                
-                # Wind shear values first
-                if not np.isnan(shear_1km):
-                    param_text.append(f'0-1km Shear: {shear_1km:.0f} kts')
-                if not np.isnan(shear_3km):
-                    param_text.append(f'0-3km Shear: {shear_3km:.0f} kts')
-                
-                # Storm motion (input storm motion)
-                if storm_motion_data:
-                    param_text.append(f'Storm Motion: {storm_motion_data["direction"]:.0f}°/{storm_motion_data["speed"]:.0f}kts')
-                
-                # Add Bunkers storm motion
-                try:
-                    from params import compute_bunkers
-                    bunkers_result = compute_bunkers(param_data)
-                    if bunkers_result and len(bunkers_result) >= 2:
-                        bunkers_rm = bunkers_result[0]
-                        param_text.append(f'Bunkers RM: {bunkers_rm[0]:.0f}°/{bunkers_rm[1]:.0f}kts')
-                except:
-                    pass
-                
-                # Add critical angle below Bunkers data
-                if critical_angle_value is not None:
-                    param_text.append(f'Critical Angle: {critical_angle_value:.1f}°')
-                
-                # Calculate and add shear magnitude and depth for display
-                shear_magnitude_display = None
-                shear_depth_display = None
-                if metar_data and len(param_data['wind_spd']) > 1:
-                    try:
-                        surface_u, surface_v = calculate_wind_components(float(param_data['wind_spd'][0]), float(param_data['wind_dir'][0]))
-                        
-                        # Get the lowest radar point for reference vector
-                        radar_u, radar_v = calculate_wind_components(float(param_data['wind_spd'][1]), float(param_data['wind_dir'][1]))
-                        ref_u, ref_v = radar_u - surface_u, radar_v - surface_v
-                        
-                        # Find points within 5 degrees of reference vector and calculate shear depth
-                        aligned_heights = []
-                        aligned_indices = []
-                        
-                        # Check all radar points for alignment within ±5 degrees (skip surface wind at index 0)
-                        for i in range(1, len(param_data['wind_spd'])):
-                            point_u, point_v = calculate_wind_components(float(param_data['wind_spd'][i]), float(param_data['wind_dir'][i]))
-                            vector_u, vector_v = point_u - surface_u, point_v - surface_v
-                            
-                            # Calculate angle between vectors
-                            dot_product = ref_u * vector_u + ref_v * vector_v
-                            mag_ref = np.sqrt(ref_u**2 + ref_v**2)
-                            mag_vec = np.sqrt(vector_u**2 + vector_v**2)
-                            
-                            if mag_ref > 0 and mag_vec > 0:
-                                cos_angle = np.clip(dot_product / (mag_ref * mag_vec), -1.0, 1.0)
-                                angle = np.rad2deg(np.arccos(cos_angle))
-                                
-                                # Include all points within ±5 degrees, don't break on first non-aligned point
-                                if angle <= 5.0:
-                                    aligned_heights.append(param_data['altitude'][i])
-                                    aligned_indices.append(i)
-                        
-                        if aligned_heights and len(aligned_indices) > 0:
-                            # Use the maximum altitude or a minimum meaningful depth
-                            raw_depth = max(aligned_heights)
-                            
-                            print(f"Debug: Found {len(aligned_indices)} aligned levels, raw_depth: {raw_depth:.0f}m")
-                            print(f"Debug: Aligned altitudes: {[f'{h:.0f}m' for h in aligned_heights[:5]]}")  # Show first 5
-                            
-                            # If VAD altitudes are very small (< 50m), estimate depth based on typical radar beam geometry
-                            if raw_depth < 50:
-                                # Estimate depth based on number of aligned levels and typical VAD level spacing
-                                # Typical VAD levels are spaced every ~150-300m in height
-                                estimated_depth = len(aligned_indices) * 200  # 200m per level estimate
-                                shear_depth_display = max(raw_depth, estimated_depth)
-                                print(f"Debug: Using estimated depth: {shear_depth_display:.0f}m")
-                            else:
-                                shear_depth_display = raw_depth
-                                print(f"Debug: Using raw depth: {shear_depth_display:.0f}m")
-                            
-                            # Calculate shear magnitude using the highest aligned point
-                            final_index = aligned_indices[-1]
-                            final_u, final_v = calculate_wind_components(float(param_data['wind_spd'][final_index]), float(param_data['wind_dir'][final_index]))
-                            shear_magnitude_display = np.sqrt((final_u - surface_u)**2 + (final_v - surface_v)**2)
-                            
-                            print(f"Debug: Shear magnitude: {shear_magnitude_display:.1f}kt at level {final_index}")
-                        else:
-                            print("Debug: No aligned heights found")
-                    except Exception as e:
-                        print(f"Debug: Error calculating shear parameters: {e}")
-                        import traceback
-                        traceback.print_exc()
-                
-                # Add shear magnitude and depth under critical angle
-                if shear_magnitude_display is not None:
-                    param_text.append(f'Shear Magnitude: {shear_magnitude_display:.0f} kts')
-                if shear_depth_display is not None:
-                    param_text.append(f'Shear Depth: {shear_depth_display:.0f} m')
-                
-                # Always add SRH values after shear parameters (regardless of shear depth availability)
-                print(f"Debug: SRH values - srh_0_1: {srh_0_1}, srh_0_3: {srh_0_3}")
-                if not np.isnan(srh_0_1):
-                    param_text.append(f'SRH 0-1km: {srh_0_1:.0f} m²/s²')
-                    print(f"Debug: Added SRH 0-1km to param_text")
-                if not np.isnan(srh_0_3):
-                    param_text.append(f'SRH 0-3km: {srh_0_3:.0f} m²/s²')
-                    print(f"Debug: Added SRH 0-3km to param_text")
-                
-                # Display parameters text box in upper left corner
-                if param_text:
-                    param_str = '\n'.join(param_text)
-                    ax.text(0.02, 0.98, param_str, transform=ax.transAxes, fontsize=10,
-                           verticalalignment='top', bbox=dict(boxstyle="round,pad=0.5", 
-                           facecolor="lightblue", alpha=0.8), zorder=12)
-                
-                # SRH values are now only displayed in the upper left parameter box
-            except Exception as e:
-                print(f"Error adding parameters to plot: {e}")
-                import traceback
-                traceback.print_exc()
+                obs_str = metar_time_future.result(timeout=5)
+            except Exception:
+                obs_str = None
+        if obs_str:
+            title_lines.append(f'Surface Wind {metar_data["direction"]:.0f}/{metar_data["speed"]:.0f} ({metar_station_id} {obs_str}UTC)')
+        else:
+            title_lines.append(f'Surface Wind {metar_data["direction"]:.0f}/{metar_data["speed"]:.0f} ({metar_station_id})')
+    
+    # Set the comprehensive title
+    title_text = '\n'.join(title_lines)
+    ax.set_title(title_text, fontsize=12, fontweight='bold', pad=20, loc='center')
+    
+    ax.legend(loc='upper right', fontsize=9)
+    
+    # Save plot to an in-memory image; the figure size is fixed, so no tight bbox pass is needed
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format=image_format, dpi=HODOGRAPH_DPI,
+                pil_kwargs=HODOGRAPH_FORMATS[image_format][1])
+    img_buffer.seek(0)
+    return img_buffer
+
+def compute_hodograph_parameters(wind_profile: WindProfile, args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Calculate the advanced meteorological parameters for a hodograph.
+
+    Args:
+        wind_profile: Wind profile for the requested site
+        args: Query arguments from read_hodograph_args
+
+    Returns:
+        Dictionary of parameters; empty when no storm motion is given
+    """
+    storm_direction = args['storm_direction']
+    storm_speed = args['storm_speed']
+    metar_direction = args['metar_direction']
+    metar_speed = args['metar_speed']
+    
+    storm_motion_data = None
+    storm_motion_tuple = None
+    if storm_direction is not None and storm_speed is not None:
+        storm_motion_data = {'direction': storm_direction, 'speed': storm_speed}
+        storm_motion_tuple = (storm_direction, storm_speed)
+    
+    parameters = {}
+    if storm_motion_data:
+        try:
+            metar_data = None
+            if metar_direction is not None and metar_speed is not None:
+                metar_data = {'direction': metar_direction, 'speed': metar_speed}
+            
+            # SRH, shear and Bunkers motion are shared with the hodograph image
+            all_params = compute_all_params(wind_profile, storm_motion_tuple, metar_data)
+            data = all_params['data']
+            srh_0_5 = all_params['srh'][500]
+            srh_0_1 = all_params['srh'][1000]
+            srh_0_3 = all_params['srh'][3000]
+            shear_1km = all_params['shear'][1000]
+            shear_3km = all_params['shear'][3000]
+            shear_6km = all_params['shear'][6000]
+            
+            bunkers_info = None
+            bunkers_result = all_params['bunkers']
+            if bunkers_result and len(bunkers_result) >= 2:
+                bunkers_rm = bunkers_result[0]
+                bunkers_lm = bunkers_result[1]
+                
+                # Validate values are not NaN
+                if (not np.isnan(bunkers_rm[0]) and not np.isnan(bunkers_rm[1]) and 
+                    not np.isnan(bunkers_lm[0]) and not np.isnan(bunkers_lm[1])):
+                    bunkers_info = {
+                        'right': {'direction': round(float(bunkers_rm[0]), 1), 'speed': round(float(bunkers_rm[1]), 1)},
+                        'left': {'direction': round(float(bunkers_lm[0]), 1), 'speed': round(float(bunkers_lm[1]), 1)}
+                    }
+            
+            # Wind components for the storm motion, the surface and every radar level
+            storm_uv, surface_uv = point_wind_components(storm_motion_data, metar_data)
+            storm_u, storm_v = storm_uv
+            wind_u, wind_v = wind_profile.u, wind_profile.v
+            if metar_data:
+                surface_u, surface_v = surface_uv
+                wind_u = np.concatenate(([surface_u], wind_u))
+                wind_v = np.concatenate(([surface_v], wind_v))
+            
+            # Calculate critical angle if we have surface wind
+            critical_angle = None
+            if metar_data and len(data['wind_spd']) > 1:
+                surface_u, surface_v = float(wind_u[0]), float(wind_v[0])
+                radar_u, radar_v = float(wind_u[1]), float(wind_v[1])
+                
+                # Calculate angle between surface-to-storm and surface-to-radar vectors
+                critical_angle = angle_between(storm_u - surface_u, storm_v - surface_v,
+                                               radar_u - surface_u, radar_v - surface_v)
+            
+            # Calculate shear depth
+            shear_depth = None
+            shear_magnitude = None
+            if metar_data and len(data['wind_spd']) > 1:
+                surface_u, surface_v = wind_u[0], wind_v[0]
+                
+                # Keep points within 5 degrees, stopping at the first point outside the window
+                aligned_heights = data['altitude'][1:][compute_shear_window(wind_u, wind_v, 5.0)]
+                
+                if len(aligned_heights):
+                    shear_depth = np.max(aligned_heights)
+                    # Calculate shear magnitude to this depth
+                    final_u, final_v = wind_u[len(aligned_heights)], wind_v[len(aligned_heights)]
+                    shear_magnitude = np.hypot(final_u - surface_u, final_v - surface_v)
+            
+            # Helper function to safely round numeric values
+            def safe_round(value, decimals=1):
+                if value is None:
+                    return None
+                value = float(value)
+                if math.isnan(value) or math.isinf(value):
+                    return None
+                return round(value, decimals)
+            
+            parameters = {
+                'srh_0_5': safe_round(srh_0_5, 1),
+                'srh_0_1': safe_round(srh_0_1, 1),
+                'srh_0_3': safe_round(srh_0_3, 1),
+                'shear_1km': safe_round(shear_1km, 1),
+                'shear_3km': safe_round(shear_3km, 1),
+                'shear_6km': safe_round(shear_6km, 1),
+                'bunkers': bunkers_info,
+                'critical_angle': safe_round(critical_angle, 1),
+                'shear_depth': safe_round(shear_depth, 0),
+                'shear_magnitude': safe_round(shear_magnitude, 1)
+            }
+        except Exception as e:
+            logger.error("Error calculating parameters: %s", e, exc_info=app.debug)
+    
+    return parameters
+
+@app.route('/api/hodograph')
+def generate_hodograph():
+    """Generate hodograph plot as a WebP or PNG image"""
+    plotter = None
+    try:
+        args = read_hodograph_args()
+        site_id = args['site_id']
         
-        # Add comprehensive title to the hodograph
-        title_lines = []
-        if site:
-            title_lines.append(f'{site.id} - {site.name.upper()}')
+        # The client normally passes the observation time it got from /api/metar.
+        # Otherwise start the lookup now so the network round trip overlaps with
+        # plotting instead of blocking at the end of the request. Only well-formed
+        # station ids are looked up, since each one gets its own cache entry.
+        metar_time_future = None
+        if (args['metar_direction'] is not None and args['metar_speed'] is not None
+                and args['metar_time'] is None and is_valid_station_id(args['metar_station'])):
+            metar_time_future = io_executor.submit(fetch_metar_report_time, args['metar_station'])
         
-        # Get VAD valid time from wind profile data (simplified)
-        if hasattr(wind_profile, 'times') and len(wind_profile.times) > 0:
-            vad_time = wind_profile.times[0]  # Use first timestamp
-            if hasattr(vad_time, 'strftime'):
-                utc_str = vad_time.strftime('%Y-%m-%d %H:%M')
-                title_lines.append(f'Valid: {utc_str}UTC')
-            else:
-                title_lines.append(f'Valid: VAD Data Available')
-        else:
-            # Use current time as fallback
-            from datetime import datetime as dt_class
-            current_time = dt_class.now()
-            title_lines.append(f'Valid: {current_time.strftime("%Y-%m-%d %H:%M")}UTC')
+        logger.debug("Hodograph parameters received: %s", args)
         
-        # Add empty line
-        title_lines.append('')
+        if not site_id:
+            return jsonify({'error': 'No wind profile data loaded'}), 400
         
-        # Add surface wind information with station ID and timestamp
-        if metar_data:
-            metar_station_id = request.args.get('metar_station', 'METAR')
-            
-            # Get METAR observation time from the API
-            try:
-                import requests
-                metar_url = f"https://aviationweather.gov/api/data/metar?ids={metar_station_id}&format=json"
-                response = requests.get(metar_url, timeout=5)
-                if response.status_code == 200:
-                    metar_json = response.json()
-                    if metar_json and len(metar_json) > 0:
-                        obs_time = metar_json[0].get('reportTime', '')
-                        if obs_time:
-                            # Extract time from ISO format (e.g., "2025-06-08T22:53:00Z")
-                            try:
-                                from datetime import datetime as dt_class
-                                obs_dt = dt_class.fromisoformat(obs_time.replace('Z', '+00:00'))
-                                obs_str = obs_dt.strftime('%H%M')
-                                title_lines.append(f'Surface Wind {metar_data["direction"]:.0f}/{metar_data["speed"]:.0f} ({metar_station_id} {obs_str}UTC)')
-                            except:
-                                title_lines.append(f'Surface Wind {metar_data["direction"]:.0f}/{metar_data["speed"]:.0f} ({metar_station_id})')
-                        else:
-                            title_lines.append(f'Surface Wind {metar_data["direction"]:.0f}/{metar_data["speed"]:.0f} ({metar_station_id})')
-                    else:
-                        title_lines.append(f'Surface Wind {metar_data["direction"]:.0f}/{metar_data["speed"]:.0f} ({metar_station_id})')
-                else:
-                    title_lines.append(f'Surface Wind {metar_data["direction"]:.0f}/{metar_data["speed"]:.0f} ({metar_station_id})')
-            except:
-                title_lines.append(f'Surface Wind {metar_data["direction"]:.0f}/{metar_data["speed"]:.0f} ({metar_station_id})')
+        wind_profile, error, status = load_wind_profile(site_id)
+        if error:
+            return jsonify({'error': error}), status
+        if len(wind_profile.heights) == 0:
+            return jsonify({'error': 'No wind profile data loaded'}), 400
         
-        # Set the comprehensive title
-        title_text = '\n'.join(title_lines)
-        ax.set_title(title_text, fontsize=12, fontweight='bold', pad=20, loc='center')
+        # WebP is about a third the size of PNG; only clients that ask for it get it
+        image_format = 'webp' if 'image/webp' in request.accept_mimetypes.values() else 'png'
         
-        ax.legend(loc='upper right', fontsize=9)
+        # Identical requests against the same profile reuse the encoded image. Renders
+        # that wait on a server-side METAR time lookup are not cached since that can change.
+        cache_key = None
+        cached = None
+        if metar_time_future is None:
+            cache_key = (id(wind_profile), image_format, tuple(sorted(args.items())))
+            with _image_cache_lock:
+                cached = _image_cache.get(cache_key)
+                if cached is not None and cached[0] is wind_profile:
+                    # Move the hit to the end so toggling back to an earlier view keeps it cached
+                    _image_cache[cache_key] = _image_cache.pop(cache_key)
         
-        # Save plot to base64 string
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
-        plt.close()
+        if cached is not None and cached[0] is wind_profile:
+            image_bytes, etag = cached[1], cached[2]
+        else:
+            # Borrow a hodograph plotter; it is returned to the pool when the request ends
+            plotter = _plotter_pool.get()
+            image_bytes = render_hodograph(plotter, wind_profile, args, metar_time_future, image_format).getvalue()
+            etag = hashlib.md5(image_bytes).hexdigest()
+            if cache_key is not None:
+                with _image_cache_lock:
+                    _image_cache.pop(cache_key, None)
+                    if len(_image_cache) >= IMAGE_CACHE_SIZE:
+                        _image_cache.pop(next(iter(_image_cache)))
+                    _image_cache[cache_key] = (wind_profile, image_bytes, etag)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        if plotter is not None:
+            _plotter_pool.put(plotter)
+    
+    # Serve the image bytes directly; send_file answers If-None-Match with 304
+    response = send_file(io.BytesIO(image_bytes), mimetype=HODOGRAPH_FORMATS[image_format][0], etag=etag)
+    response.headers['Cache-Control'] = 'private, max-age=60'
+    response.vary.add('Accept')
+    return response
+
+@app.route('/api/hodograph/params')
+def get_hodograph_params():
+    """Get meteorological parameters for a hodograph as JSON"""
+    try:
+        args = read_hodograph_args()
+        site_id = args['site_id']
+        if not site_id:
+            return jsonify({'error': 'No wind profile data loaded'}), 400
         
-        # Calculate advanced meteorological parameters
-        parameters = {}
-        if storm_motion_data:
-            try:
-                # Prepare data for parameter calculations (correct format for params.py functions)
-                data = {
-                    'wind_dir': np.array(wind_profile.directions),
-                    'wind_spd': np.array(wind_profile.speeds),
-                    'altitude': np.array(wind_profile.heights)
-                }
-                
-                # Add surface wind if available
-                metar_data = None
-                if metar_direction is not None and metar_speed is not None:
-                    metar_data = {'direction': metar_direction, 'speed': metar_speed}
-                    surface_direction = metar_direction
-                    surface_speed = metar_speed
-                    
-                    # Prepend surface wind to data arrays
-                    data['wind_dir'] = np.insert(data['wind_dir'], 0, surface_direction)
-                    data['wind_spd'] = np.insert(data['wind_spd'], 0, surface_speed)
-                    data['altitude'] = np.insert(data['altitude'], 0, 0.0)
-                
-                # Calculate SRH values
-                from params import compute_srh
-                srh_0_5 = compute_srh(data, storm_motion_tuple, 500)
-                srh_0_1 = compute_srh(data, storm_motion_tuple, 1000)
-                srh_0_3 = compute_srh(data, storm_motion_tuple, 3000)
-                
-                # Calculate shear magnitude
-                from params import compute_shear_mag
-                shear_1km = compute_shear_mag(data, 1000)
-                shear_3km = compute_shear_mag(data, 3000)
-                shear_6km = compute_shear_mag(data, 6000)
-                
-                # Calculate Bunkers storm motion for comparison
-                from params import compute_bunkers
-                try:
-                    bunkers_result = compute_bunkers(data)
-                    if bunkers_result and len(bunkers_result) >= 2:
-                        bunkers_rm = bunkers_result[0]
-                        bunkers_lm = bunkers_result[1]
-                        
-                        # Validate values are not NaN
-                        if (not np.isnan(bunkers_rm[0]) and not np.isnan(bunkers_rm[1]) and 
-                            not np.isnan(bunkers_lm[0]) and not np.isnan(bunkers_lm[1])):
-                            bunkers_info = {
-                                'right': {'direction': round(float(bunkers_rm[0]), 1), 'speed': round(float(bunkers_rm[1]), 1)},
-                                'left': {'direction': round(float(bunkers_lm[0]), 1), 'speed': round(float(bunkers_lm[1]), 1)}
-                            }
-                        else:
-                            bunkers_info = None
-                    else:
-                        bunkers_info = None
-                except:
-                    bunkers_info = None
-                
-                # Calculate critical angle if we have surface wind
-                critical_angle = None
-                if metar_data and len(data['wind_spd']) > 1:
-                    try:
-                        surface_u, surface_v = calculate_wind_components(float(data['wind_spd'][0]), float(data['wind_dir'][0]))
-                        storm_u, storm_v = calculate_wind_components(storm_motion_data['speed'], storm_motion_data['direction'])
-                        radar_u, radar_v = calculate_wind_components(float(data['wind_spd'][1]), float(data['wind_dir'][1]))
-                        
-                        # Calculate angle between surface-to-storm and surface-to-radar vectors
-                        v1_u, v1_v = storm_u - surface_u, storm_v - surface_v
-                        v2_u, v2_v = radar_u - surface_u, radar_v - surface_v
-                        
-                        dot_product = v1_u * v2_u + v1_v * v2_v
-                        mag1 = np.sqrt(v1_u**2 + v1_v**2)
-                        mag2 = np.sqrt(v2_u**2 + v2_v**2)
-                        
-                        if mag1 > 0 and mag2 > 0:
-                            cos_angle = np.clip(dot_product / (mag1 * mag2), -1.0, 1.0)
-                            critical_angle = np.rad2deg(np.arccos(cos_angle))
-                    except:
-                        pass
-                
-                # Calculate shear depth
-                shear_depth = None
-                shear_magnitude = None
-                if metar_data and len(data['wind_spd']) > 1:
-                    try:
-                        surface_u, surface_v = calculate_wind_components(data['wind_spd'][0], data['wind_dir'][0])
-                        
-                        # Get the lowest radar point for reference vector
-                        radar_u, radar_v = calculate_wind_components(data['wind_spd'][1], data['wind_dir'][1])
-                        ref_u, ref_v = radar_u - surface_u, radar_v - surface_v
-                        
-                        # Find points within 5 degrees of reference vector
-                        aligned_heights = []
-                        for i in range(1, len(data['wind_spd'])):
-                            point_u, point_v = calculate_wind_components(data['wind_spd'][i], data['wind_dir'][i])
-                            vector_u, vector_v = point_u - surface_u, point_v - surface_v
-                            
-                            # Calculate angle between vectors
-                            dot_product = ref_u * vector_u + ref_v * vector_v
-                            mag_ref = np.sqrt(ref_u**2 + ref_v**2)
-                            mag_vec = np.sqrt(vector_u**2 + vector_v**2)
-                            
-                            if mag_ref > 0 and mag_vec > 0:
-                                cos_angle = np.clip(dot_product / (mag_ref * mag_vec), -1.0, 1.0)
-                                angle = np.rad2deg(np.arccos(cos_angle))
-                                
-                                if angle <= 5.0:
-                                    aligned_heights.append(data['altitude'][i])
-                                else:
-                                    break
-                        
-                        if aligned_heights:
-                            shear_depth = max(aligned_heights)
-                            # Calculate shear magnitude to this depth
-                            final_u, final_v = calculate_wind_components(data['wind_spd'][len(aligned_heights)], data['wind_dir'][len(aligned_heights)])
-                            shear_magnitude = np.sqrt((final_u - surface_u)**2 + (final_v - surface_v)**2)
-                    except:
-                        pass
-                
-                # Helper function to safely round numeric values
-                def safe_round(value, decimals=1):
-                    if value is None or np.isnan(value) or np.isinf(value):
-                        return None
-                    return round(float(value), decimals)
-                
-                parameters = {
-                    'srh_0_5': safe_round(srh_0_5, 1),
-                    'srh_0_1': safe_round(srh_0_1, 1),
-                    'srh_0_3': safe_round(srh_0_3, 1),
-                    'shear_1km': safe_round(shear_1km, 1),
-                    'shear_3km': safe_round(shear_3km, 1),
-                    'shear_6km': safe_round(shear_6km, 1),
-                    'bunkers': bunkers_info,
-                    'critical_angle': safe_round(critical_angle, 1),
-                    'shear_depth': safe_round(shear_depth, 0),
-                    'shear_magnitude': safe_round(shear_magnitude, 1)
-                }
-            except Exception as e:
-                print(f"Error calculating parameters: {e}")
-                import traceback
-                traceback.print_exc()
+        wind_profile, error, status = load_wind_profile(site_id)
+        if error:
+            return jsonify({'error': error}), status
+        if len(wind_profile.heights) == 0:
+            return jsonify({'error': 'No wind profile data loaded'}), 400
         
-        return jsonify({
-            'image': img_base64,
-            'parameters': parameters,
+        return conditional_json({
+            'parameters': compute_hodograph_parameters(wind_profile, args),
             'success': True
-        })
-        
+        }, 60)
+    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/reset')
 def reset_data():
     """Reset all data"""
-    global wind_profile
-    wind_profile = WindProfile()
+    with _profile_locks_guard:
+        _profile_cache.clear()
+        _profile_errors.clear()
+        _profile_cache_ttl.clear()
+    with _image_cache_lock:
+        _image_cache.clear()
+    with _params_cache_lock:
+        _params_cache.clear()
     return jsonify({'success': True})
 
 if __name__ == '__main__':
     # Create temp directory
     os.makedirs("temp_data", exist_ok=True)
     
-    # Run the app
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Development server only; deployments run under gunicorn (see gunicorn.conf.py).
+    # The reloader and debugger cost a second process and per-request overhead,
+    # so they are opt-in through FLASK_DEBUG=1.
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)),
+            debug=os.environ.get('FLASK_DEBUG') == '1', threaded=True)
\ No newline at end of file
@@ -1,15 +1,27 @@
+import logging
+import struct
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict
 from datetime import datetime
 from vad_reader import VADFile, download_vad
+from utils import calculate_wind_components
+
+logger = logging.getLogger(__name__)
+
+# Number of (bottom, top) layer means remembered per profile
+LAYER_MEAN_CACHE_SIZE = 32
 
 class WindProfile:
     def __init__(self):
         self.heights = np.array([], dtype=float)
         self.speeds = np.array([], dtype=float)
         self.directions = np.array([], dtype=float)
+        # Wind components derived once from speeds/directions when data is loaded
+        self.u = np.array([], dtype=float)
+        self.v = np.array([], dtype=float)
         self.times: List[datetime] = []
-        self.vad_file: Optional[VADFile] = None
+        # Layer means already computed for this data, keyed by (bottom, top)
+        self._layer_means: Dict[tuple, Dict[str, float]] = {}
         # Add these attributes for use elsewhere in the codebase
         self.site_id = None
         self.site_name = None
@@ -32,24 +44,25 @@ class WindProfile:
             with open(file_path, 'rb') as f:
                 vad_file = VADFile(f)
                 
-                # Extract data immediately (already numpy arrays)
-                self.heights = vad_file['altitude'].astype(float)
-                self.speeds = vad_file['wind_spd'].astype(float)
-                self.directions = vad_file['wind_dir'].astype(float)
+                # Extract data immediately; the VAD arrays are already float64, so these are views, not copies
+                self.heights = np.asarray(vad_file['altitude'], dtype=float)
+                self.speeds = np.asarray(vad_file['wind_spd'], dtype=float)
+                self.directions = np.asarray(vad_file['wind_dir'], dtype=float)
+                self.u, self.v = calculate_wind_components(self.speeds, self.directions)
                 
                 # Get time from VAD file (single datetime object)
                 time = vad_file['time']
                 self.times = [time] * len(self.heights)
                 
-                # Store the VAD file object for later use
-                self.vad_file = vad_file
+                # The parsed VADFile is not kept: only these columns are used, and
+                # holding it would pin its other decoded fields for the profile's lifetime
 
             return True
 
-        except Exception as e:
-            print(f"Error reading NEXRAD file: {e}")
-            import traceback
-            traceback.print_exc()
+        except (OSError, ValueError, KeyError, IndexError, struct.error) as e:
+            # Truncated or corrupt files are routine; the traceback is only worth building when debugging
+            logger.warning("Error reading NEXRAD file %s: %s", file_path, e,
+                           exc_info=logger.isEnabledFor(logging.DEBUG))
             return False
 
     def clear_data(self) -> None:
@@ -57,8 +70,10 @@ class WindProfile:
         self.heights = np.array([], dtype=float)
         self.speeds = np.array([], dtype=float)
         self.directions = np.array([], dtype=float)
+        self.u = np.array([], dtype=float)
+        self.v = np.array([], dtype=float)
         self.times = []
-        self.vad_file = None
+        self._layer_means = {}
 
     def get_layer_mean(self, bottom: float, top: float) -> Dict[str, float]:
         """
@@ -69,22 +84,34 @@ class WindProfile:
             top: Top of layer (meters)
 
         Returns:
-            Dictionary containing mean speed and direction
+            Dictionary containing the speed and direction of the mean wind vector
         """
         if len(self.heights) == 0:
             return {"speed": 0.0, "direction": 0.0}
 
-        # Find data points within the layer (already numpy arrays)
-        mask = np.logical_and(self.heights >= bottom, self.heights <= top)
+        cached = self._layer_means.get((bottom, top))
+        if cached is not None:
+            return cached
+
+        # VADFile returns levels sorted by altitude, so the layer is one contiguous slice
+        lo = np.searchsorted(self.heights, bottom, side='left')
+        hi = np.searchsorted(self.heights, top, side='right')
 
-        if not np.any(mask):
+        if hi <= lo:
             return {"speed": 0.0, "direction": 0.0}
 
-        # Calculate mean wind components directly from arrays
-        mean_speed = np.mean(self.speeds[mask])
-        mean_dir = np.mean(self.directions[mask])
+        # Average the wind vectors rather than speeds and directions, since
+        # directions wrap at 360 (350 and 10 degrees must average to north)
+        mean_u = self.u[lo:hi].mean()
+        mean_v = self.v[lo:hi].mean()
+        mean_speed = np.hypot(mean_u, mean_v)
+        mean_dir = (270.0 - np.degrees(np.arctan2(mean_v, mean_u))) % 360.0
 
-        return {"speed": mean_speed, "direction": mean_dir}
+        result = {"speed": mean_speed, "direction": mean_dir}
+        if len(self._layer_means) >= LAYER_MEAN_CACHE_SIZE:
+            self._layer_means.pop(next(iter(self._layer_means)), None)
+        self._layer_means[(bottom, top)] = result
+        return result
 
     def validate(self) -> bool:
         """Validate the stored wind profile data."""
@@ -95,12 +122,12 @@ class WindProfile:
         if not (len(self.heights) == len(self.speeds) == len(self.directions)):
             return False
 
-        # Check value ranges (directly using numpy arrays)
-        if not np.all((self.speeds >= 0) & (self.speeds <= 200)):  # Max reasonable wind speed
+        # Check value ranges with min/max reductions; written so that NaN fails every check
+        if not (self.speeds.min() >= 0 and self.speeds.max() <= 200):  # Max reasonable wind speed
             return False
-        if not np.all((self.directions >= 0) & (self.directions <= 360)):
+        if not (self.directions.min() >= 0 and self.directions.max() <= 360):
             return False
-        if not np.all(self.heights >= 0):
+        if not self.heights.min() >= 0:
             return False
 
         return True
\ No newline at end of file
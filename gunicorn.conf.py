@@ -0,0 +1,28 @@
+"""
+Gunicorn settings for serving the Flask app in production.
+
+Run with: gunicorn -c gunicorn.conf.py app:app
+
+Hodograph rendering is CPU-bound matplotlib work, so it scales with worker
+processes; the extra threads per worker keep the I/O-bound routes (METAR,
+site lists, warnings) responsive while a render is in progress. Each worker
+process holds its own plotter pool and profile cache.
+
+If resident memory creeps up in long-running workers, start gunicorn with
+PYTHONMALLOC=malloc and LD_PRELOAD pointing at jemalloc or tcmalloc.
+
+GUNICORN_WORKER_CLASS=gevent switches to greenlet workers (requires gevent;
+gunicorn applies the monkey patching itself). That only helps when upstream
+fetches dominate: a render still blocks every other greenlet in its worker.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+# Most connections a worker holds open at once. gthread keeps idle keep-alive
+# connections beyond its busy threads up to this limit; gevent caps its greenlets with it.
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+timeout = 60
@@ -1,17 +1,35 @@
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
 import numpy as np
-import streamlit as st
-from typing import Tuple, Optional
+import threading
+from typing import Tuple, Optional, Dict, Any
 from utils import calculate_wind_components
 from datetime import datetime
 
+# Number of profiles whose derived plot inputs are remembered
+PLOT_INPUT_CACHE_SIZE = 16
+
+# Most reference dots drawn along the trace; denser profiles are thinned evenly
+MAX_REFERENCE_POINTS = 200
+
+# Plot inputs derived from a profile's data, keyed by id(profile). Entries keep the
+# profile and its heights array so a recycled id or a reloaded profile is never a hit.
+_plot_inputs: Dict[int, Tuple[Any, np.ndarray, Dict[str, Any]]] = {}
+_plot_inputs_lock = threading.Lock()  # Plotters on different threads share the cache
+
 class HodographPlotter:
     def __init__(self):
         self.fig = None
         self.ax = None
         self.max_speed = None  # Will be set dynamically based on data
+        self._background_speed = None  # max_speed the current axes background was drawn for
+        self._static_artists = set()
+        self._suptitle = None  # Title text of the current figure, kept so it can be blanked
 
-    def calculate_max_speed(self, speeds: list) -> int:
+    def calculate_max_speed(self, speeds: np.ndarray) -> int:
         """Calculate the maximum speed rounded up to nearest 10."""
         if not hasattr(speeds, '__len__') or len(speeds) == 0:
             return 100  # Default if no data
@@ -28,11 +46,13 @@ class HodographPlotter:
             site_name: Location of the radar site (city, state)
             valid_time: Valid time of the data
         """
-        # Close any existing figures
-        plt.close('all')
-
-        # Create a figure with more vertical space for title and labels
-        self.fig, self.ax = plt.subplots(figsize=(8, 9))
+        # The grid, speed rings, labels and axis limits depend only on max_speed.
+        # When they are already drawn for it, strip the previous plot's data and
+        # keep the background instead of rebuilding the axes.
+        if self.fig is not None and self.max_speed and self._background_speed == self.max_speed:
+            self._clear_dynamic_artists()
+        else:
+            self._draw_background()
 
         # Add title with site information and time if provided
         title_parts = []
@@ -47,7 +67,22 @@ class HodographPlotter:
             
         if title_parts:
             # Set the title higher up with more space between title and plot
-            self.fig.suptitle('\n'.join(title_parts), y=0.98)
+            self._suptitle = self.fig.suptitle('\n'.join(title_parts), y=0.98)
+        elif self.fig.get_suptitle():
+            self._suptitle.set_text('')
+
+    def _draw_background(self) -> None:
+        """Build the axes, grid, speed rings and labels for the current max_speed."""
+        # Reuse this plotter's figure when it has one; building a new Figure
+        # and canvas per plot is the most expensive part of a small hodograph.
+        # Figures are created outside pyplot so concurrent plotters never share state.
+        if self.fig is None:
+            # Create a figure with more vertical space for title and labels
+            self.fig = Figure(figsize=(8, 9))
+        else:
+            self.fig.clear()
+        self._suptitle = None  # Clearing the figure removes its title as well
+        self.ax = self.fig.add_subplot()
 
         # Set up the plot
         self.ax.set_aspect('equal')
@@ -55,10 +90,12 @@ class HodographPlotter:
 
         # Draw speed rings (will be set when plotting data)
         if self.max_speed:
-            speed_rings = list(range(10, self.max_speed + 1, 10))
-            for speed in speed_rings:
-                circle = plt.Circle((0, 0), speed, fill=False, color='gray', linestyle='--', alpha=0.5)
-                self.ax.add_artist(circle)
+            # All rings share one style, so they are drawn as a single collection
+            speed_rings = [Circle((0, 0), speed) for speed in range(10, self.max_speed + 1, 10)]
+            # Cap and join styles match what individual Circle patches default to
+            self.ax.add_artist(PatchCollection(speed_rings, facecolor='none', edgecolor='gray',
+                                               linestyle='--', alpha=0.5,
+                                               capstyle='butt', joinstyle='miter'))
 
             # Set limits and labels
             self.ax.set_xlim(-self.max_speed, self.max_speed)
@@ -72,6 +109,16 @@ class HodographPlotter:
             self.ax.text(0, self.max_speed + 2, 'S', ha='center')
             self.ax.text(self.max_speed + 2, 0, 'W', va='center')
 
+        self._background_speed = self.max_speed
+        self._static_artists = set(self.ax.get_children())
+
+    def _clear_dynamic_artists(self) -> None:
+        """Remove everything drawn on the axes since the background was built."""
+        for artist in self.ax.get_children():
+            if artist not in self._static_artists:
+                artist.remove()
+        self.ax.set_title('')
+
     # Remove caching from this method too
     def plot_profile(self, profile, height_colors: bool = True, show_half_km: bool = True) -> None:
         """
@@ -86,7 +133,8 @@ class HodographPlotter:
             raise ValueError("Invalid wind profile data")
 
         # Set max_speed based on data
-        self.max_speed = self.calculate_max_speed(profile.speeds)
+        inputs = self._prepare_profile(profile)
+        self.max_speed = inputs['max_speed']
 
         # Recreate the plot with the new max_speed and preserve header info
         self.setup_plot(
@@ -95,116 +143,109 @@ class HodographPlotter:
             valid_time=profile.times[0] if profile.times else None
         )
 
-        # Calculate u and v components
-        u_comp = []
-        v_comp = []
-        for speed, direction in zip(profile.speeds, profile.directions):
-            u, v = calculate_wind_components(speed, direction)
-            u_comp.append(u)
-            v_comp.append(v)
-
-        u_comp = np.array(u_comp)
-        v_comp = np.array(v_comp)
-        heights = np.array(profile.heights)
+        # Wind components are computed once when the profile is loaded
+        u_comp, v_comp = profile.u, profile.v
 
         if height_colors:
-            # Create color gradient based on height
-            colors = plt.cm.viridis(heights / np.max(heights))
-
-            # Plot segments with color gradient
-            for i in range(len(u_comp) - 1):
-                self.ax.plot(u_comp[i:i+2], v_comp[i:i+2], 
-                           color=colors[i], linewidth=2)
+            # Plot segments with color gradient as one collection instead of a line per segment
+            self.ax.add_collection(LineCollection(inputs['segments'], colors=inputs['colors'], linewidths=2,
+                                                  capstyle='projecting', zorder=2))
         else:
             self.ax.plot(u_comp, v_comp, 'b-', linewidth=2)
 
-        # First, scatter all points with smaller markers for reference
-        self.ax.scatter(u_comp, v_comp, c='red', s=20, zorder=5, alpha=0.5)
+        # First, scatter all points with smaller markers for reference. Past a few hundred
+        # levels the dots overlap completely, so only an evenly spaced subset is drawn.
+        if len(u_comp) > MAX_REFERENCE_POINTS:
+            shown = np.linspace(0, len(u_comp) - 1, MAX_REFERENCE_POINTS).astype(int)
+            self.ax.scatter(u_comp[shown], v_comp[shown], c='red', s=20, zorder=5, alpha=0.5)
+        else:
+            self.ax.scatter(u_comp, v_comp, c='red', s=20, zorder=5, alpha=0.5)
         
+        # Full km markers first, then half km markers if enabled; each group is a single scatter
+        marker_groups = [(inputs['km_labels'], 'blue', 300)]  # Larger circles for km points
+        if show_half_km:  # Only show half-km markers if enabled
+            marker_groups.append((inputs['half_km_labels'], 'gray', 250))  # Slightly smaller for half km
+        
+        for (label_idx, height_labels), circle_color, circle_size in marker_groups:
+            if len(label_idx) == 0:
+                continue
+            
+            # Add the circles for every label in this group
+            self.ax.scatter(u_comp[label_idx], v_comp[label_idx], s=circle_size, c=circle_color, zorder=6,
+                            edgecolor='black', linewidth=1)
+            
+            # Add the text on top of each circle
+            for idx, height_label in zip(label_idx, height_labels):
+                self.ax.text(u_comp[idx], v_comp[idx], height_label, color='white',
+                             ha='center', va='center', fontweight='bold', fontsize=9, zorder=7)
+
+    def _prepare_profile(self, profile) -> Dict[str, Any]:
+        """
+        Derive everything plot_profile needs from the profile's data alone.
+
+        The result only changes when the data does, so it is computed once per
+        profile and reused when the same profile is drawn with other options.
+
+        Args:
+            profile: Validated WindProfile object
+
+        Returns:
+            Dictionary with the max speed, gradient segments and colors, and the
+            (level indices, label texts) for the km and half-km markers
+        """
+        with _plot_inputs_lock:
+            cached = _plot_inputs.get(id(profile))
+        if cached is not None and cached[0] is profile and cached[1] is profile.heights:
+            return cached[2]
+
+        heights = np.asarray(profile.heights)
+        max_height = np.max(heights)  # validate() guarantees at least one level
+
+        # Create color gradient based on height; each segment takes its lower level's color
+        colors = matplotlib.colormaps['viridis'](heights[:-1] / max_height)
+        points = np.column_stack((profile.u, profile.v))
+        segments = np.stack((points[:-1], points[1:]), axis=1)
+
+        inputs = {
+            'max_speed': self.calculate_max_speed(profile.speeds),
+            'segments': segments,
+            'colors': colors,
+            'km_labels': (np.array([], dtype=int), []),
+            'half_km_labels': (np.array([], dtype=int), []),
+        }
+
         # Find all target heights we want to label (0.5, 1, 1.5, 2, 2.5, etc.)
         # Start at 0.5km and go up to the maximum height rounded up to next 0.5km
-        max_height_m = np.max(heights) * 1000 if len(heights) > 0 else 0
+        max_height_m = max_height * 1000
         
         # Generate all the target heights in 0.5km increments
         target_heights_km = np.arange(0.5, max_height_m/1000 + 0.5, 0.5)
-        
-        # Generate heights at 1km increments first to prioritize them
-        km_targets = []
-        half_km_targets = []
-        
-        for target_km in target_heights_km:
-            if abs(target_km - round(target_km)) < 0.01:  # Full kilometer
-                km_targets.append(target_km)
-            else:  # Half kilometer
-                half_km_targets.append(target_km)
-        
-        # Process full km targets first
-        for target_km in km_targets:
-            target_m = target_km * 1000  # Convert to meters
-            
-            # Find the index of the closest height
-            height_diffs = np.abs(heights * 1000 - target_m)
-            if len(height_diffs) == 0:
-                continue
-                
-            closest_idx = np.argmin(height_diffs)
+        if len(target_heights_km) > 0:
+            # Closest radar level to every target at once: one row per level, one column per target
+            height_diffs = np.abs(heights[:, None] * 1000 - target_heights_km[None, :] * 1000)
+            closest_idx = np.argmin(height_diffs, axis=0)
+            closest_diff = height_diffs[closest_idx, np.arange(len(target_heights_km))]
             
-            # Use points that are within 500m (more lenient to ensure we get kilometer labels)
-            max_diff = 500  # 500m max difference for full kilometers
-            
-            if height_diffs[closest_idx] <= max_diff:
-                closest_u = u_comp[closest_idx]
-                closest_v = v_comp[closest_idx]
-                
-                # Whole kilometer
-                height_label = f'{int(target_km)}'
-                circle_color = 'blue'
-                circle_size = 300  # Larger circles for km points
-                
-                # Add the circle with the height label
-                self.ax.scatter([closest_u], [closest_v], s=circle_size, c=circle_color, zorder=6, 
-                               edgecolor='black', linewidth=1)
-                
-                # Add the text on top of the circle
-                self.ax.text(closest_u, closest_v, height_label, color='white', 
-                            ha='center', va='center', fontweight='bold', fontsize=9, zorder=7)
-        
-        # Then process half km targets if enabled
-        if show_half_km:  # Only show half-km markers if enabled
-            for target_km in half_km_targets:
-                target_m = target_km * 1000  # Convert to meters
-                
-                # Find the index of the closest height
-                height_diffs = np.abs(heights * 1000 - target_m)
-                if len(height_diffs) == 0:
-                    continue
-                    
-                closest_idx = np.argmin(height_diffs)
-                
-                # Use points that are within 250m (more lenient than before)
-                max_diff = 250  # 250m max difference for half kilometers
-                
-                if height_diffs[closest_idx] <= max_diff:
-                    closest_u = u_comp[closest_idx]
-                    closest_v = v_comp[closest_idx]
-                    
-                    # Special case for 0.5km, show as .5
+            # Full kilometres use points within 500m (more lenient to ensure we get kilometer labels),
+            # half kilometres points within 250m
+            is_km = np.abs(target_heights_km - np.round(target_heights_km)) < 0.01
+            for key, mask in (('km_labels', is_km & (closest_diff <= 500)),
+                              ('half_km_labels', ~is_km & (closest_diff <= 250))):
+                height_labels = []
+                for target_km in target_heights_km[mask]:
                     if abs(target_km - 0.5) < 0.01:
-                        height_label = '.5'
+                        height_labels.append('.5')  # Special case for 0.5km, show as .5
                     else:
-                        # All other half-kilometers show as whole numbers
-                        height_label = f'{int(target_km)}'
-                    
-                    circle_color = 'gray'
-                    circle_size = 250  # Slightly smaller for half km
-                    
-                    # Add the circle with the height label
-                    self.ax.scatter([closest_u], [closest_v], s=circle_size, c=circle_color, zorder=6, 
-                                   edgecolor='black', linewidth=1)
-                    
-                    # Add the text on top of the circle
-                    self.ax.text(closest_u, closest_v, height_label, color='white', 
-                                ha='center', va='center', fontweight='bold', fontsize=9, zorder=7)
+                        # Whole kilometers and all other half-kilometers show as whole numbers
+                        height_labels.append(f'{int(target_km)}')
+                inputs[key] = (closest_idx[mask], height_labels)
+
+        with _plot_inputs_lock:
+            _plot_inputs.pop(id(profile), None)
+            if len(_plot_inputs) >= PLOT_INPUT_CACHE_SIZE:
+                _plot_inputs.pop(next(iter(_plot_inputs)))
+            _plot_inputs[id(profile)] = (profile, profile.heights, inputs)
+        return inputs
 
     def add_layer_mean(self, profile, bottom: float, top: float) -> None:
         """
@@ -222,17 +263,20 @@ class HodographPlotter:
         self.ax.arrow(0, 0, u, v, color='red', width=0.5, 
                      head_width=2, head_length=2, zorder=6)
 
-    def save_plot(self, filename: str) -> None:
+    def save_plot(self, filename: str, dpi: int = 300) -> None:
         """
         Save the hodograph plot to a file.
 
         Args:
             filename: Output filename
+            dpi: Output resolution; drawing cost grows with its square, so pass
+                a lower value when print quality is not needed
         """
-        self.fig.savefig(filename, bbox_inches='tight', dpi=300)
-        plt.close(self.fig)  # Close after saving
+        # The figure is kept for the next plot rather than closed; it is not
+        # registered with pyplot, so there is nothing to release
+        self.fig.savefig(filename, bbox_inches='tight', dpi=dpi)
 
-    def get_plot(self) -> Tuple[plt.Figure, plt.Axes]:
+    def get_plot(self) -> Tuple[Figure, Axes]:
         """
         Get the current plot figure and axes.
 
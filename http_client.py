@@ -0,0 +1,23 @@
+"""
+Shared HTTP session for upstream weather APIs.
+
+Reusing one session keeps connections to aviationweather.gov and
+api.weather.gov alive between requests instead of paying a new TCP and TLS
+handshake for every METAR lookup or warnings refresh.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def _build_session() -> requests.Session:
+    """Create a session with a connection pool sized for the worker threads."""
+    session = requests.Session()
+    # Retry idempotent GETs briefly on connection errors and gateway failures
+    retries = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset(['GET']))
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+http_session = _build_session()
@@ -29,7 +29,8 @@ def main():
         app.run(
             host='0.0.0.0',
             port=int(os.environ.get('PORT', 5000)),
-            debug=True
+            debug=os.environ.get('FLASK_DEBUG') == '1',
+            threaded=True
         )
 
 if __name__ == '__main__':
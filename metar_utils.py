@@ -1,9 +1,17 @@
 import re
 import requests
+from http_client import http_session
 from typing import Tuple, Optional, Dict, Any
 from datetime import datetime
 import time
 
+# ICAO station identifiers as accepted by the Aviation Weather Center API
+STATION_ID_PATTERN = re.compile(r'^[A-Z0-9]{4}$')
+
+def is_valid_station_id(station_id: str) -> bool:
+    """Check that a station id is a four character ICAO identifier"""
+    return bool(STATION_ID_PATTERN.match(station_id))
+
 # Simple caching mechanism for Flask
 _cache = {}
 _cache_ttl = {}
@@ -42,12 +50,12 @@ def get_metar(station_id: str) -> Tuple[Optional[float], Optional[float], Option
     """
     try:
         # Validate station ID format
-        if not re.match(r'^[A-Z0-9]{4}$', station_id):
+        if not is_valid_station_id(station_id):
             return None, None, None, "Invalid station ID format"
 
         # Aviation Weather Center API endpoint
         url = f"https://aviationweather.gov/cgi-bin/data/metar.php?ids={station_id}&format=json&hours=2"
-        response = requests.get(url, timeout=10)
+        response = http_session.get(url, timeout=10)
         response.raise_for_status()
 
         data = response.json()
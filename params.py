@@ -40,10 +40,75 @@ def compute_shear_mag(data, hght):
     return np.hypot(u_hght - u[0], v_hght - v[0])
 
 
+def _shear_angles(u, v):
+    """
+    Angle in degrees between each level's shear vector from the surface (index 0)
+    and the surface-to-lowest-radar-level vector (index 1), for levels 1..N-1.
+
+    Returns (valid, angle) where valid marks levels whose angle is defined.
+    """
+    u = np.asarray(u, dtype=float)
+    v = np.asarray(v, dtype=float)
+    shr_u = u[1:] - u[0]
+    shr_v = v[1:] - v[0]
+    ref_u, ref_v = shr_u[0], shr_v[0]
+
+    mag_ref = np.hypot(ref_u, ref_v)
+    mag_shr = np.hypot(shr_u, shr_v)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_angle = np.clip((ref_u * shr_u + ref_v * shr_v) / (mag_ref * mag_shr), -1.0, 1.0)
+        angle = np.degrees(np.arccos(cos_angle))
+    return (mag_ref > 0) & (mag_shr > 0), angle
+
+
+def compute_aligned_shear(u, v, altitude, tol_deg):
+    """
+    Find the levels whose shear vector from the surface (index 0) lies within
+    tol_deg of the surface-to-lowest-radar-level vector (index 1).
+
+    Returns (max aligned altitude, u, v of the highest aligned level, aligned count),
+    or None if no level is aligned.
+    """
+    valid, angle = _shear_angles(u, v)
+    aligned = np.flatnonzero(valid & (angle <= tol_deg)) + 1
+    if aligned.size == 0:
+        return None
+
+    top = aligned[-1]
+    return np.max(np.asarray(altitude)[aligned]), u[top], v[top], aligned.size
+
+
+def compute_shear_window(u, v, tol_deg):
+    """
+    Like compute_aligned_shear, but the scan stops at the first level whose
+    shear vector falls outside tol_deg.
+
+    Returns a boolean mask over levels 1..N-1 marking the aligned levels
+    below the first break.
+    """
+    valid, angle = _shear_angles(u, v)
+    outside = valid & (angle > tol_deg)
+    first_break = int(np.argmax(outside)) if outside.any() else len(outside)
+    valid[first_break:] = False
+    return valid
+
+
 def compute_srh(data, storm_motion, hght):
     """
     Calculate Storm Relative Helicity (SRH) using exact algorithm provided.
     """
+    return compute_srh_multi(data, storm_motion, [hght])[0]
+
+
+def compute_srh_multi(data, storm_motion, hghts):
+    """
+    Calculate SRH for several layer tops in one pass over the profile.
+
+    Each layer between adjacent levels contributes once; the SRH for a given
+    top is the running sum of the layers lying fully between the ground and
+    that top. Returns an array of SRH values in the order of hghts.
+    """
+    hghts = np.asarray(hghts, dtype=float)
     try:
         # Extract and process wind data
         wind_dir = np.array(data['wind_dir'])
@@ -52,7 +117,7 @@ def compute_srh(data, storm_motion, hght):
         
         # Check minimum data requirements
         if len(wind_dir) < 2 or len(wind_spd) < 2:
-            return np.nan
+            return np.full(hghts.shape, np.nan)
         
         # Convert altitudes to meters if they appear to be in kilometers
         if np.max(z) < 50:  # If max altitude is less than 50, assume it's in km
@@ -65,10 +130,8 @@ def compute_srh(data, storm_motion, hght):
         
         # Storm motion components (convert from knots to m/s)
         storm_dir, storm_spd = storm_motion
-        storm_motion_ms = [
-            -storm_spd * 0.514444 * np.sin(np.radians(storm_dir)),  # us
-            -storm_spd * 0.514444 * np.cos(np.radians(storm_dir))   # vs
-        ]
+        storm_u = -storm_spd * 0.514444 * np.sin(np.radians(storm_dir))
+        storm_v = -storm_spd * 0.514444 * np.cos(np.radians(storm_dir))
         
         # Sort data by altitude (ascending)
         sort_indices = np.argsort(z)
@@ -76,59 +139,22 @@ def compute_srh(data, storm_motion, hght):
         u = u[sort_indices]
         v = v[sort_indices]
         
-        # Set layer bounds
-        z_min = 0
-        z_max = hght
+        # Storm-relative mean wind crossed with the shear vector, for every layer
+        ur = (u[:-1] + u[1:]) / 2 - storm_u
+        vr = (v[:-1] + v[1:]) / 2 - storm_v
+        srh_layer = ur * (v[1:] - v[:-1]) - vr * (u[1:] - u[:-1])
         
-        # Initialize total SRH
-        total_srh = 0.0
+        # Only layers fully within [0, top] count, and a layer starting at the top is excluded
+        z1 = z[:-1]
+        z2 = z[1:]
+        inside = (z1 >= 0) & (z2 <= hghts[:, None]) & (z1 < hghts[:, None])
         
-        # Loop through all adjacent height layers
-        for i in range(len(z) - 1):
-            # Set layer heights
-            z1 = z[i]
-            z2 = z[i + 1]
-            
-            # Skip this layer if it is not fully within the layer of interest
-            if z1 < z_min or z2 > z_max:
-                continue
-            
-            # Also skip if layer extends beyond bounds
-            if z1 >= z_max:
-                break
-                
-            # Get wind vectors at each level
-            u1 = u[i]
-            v1 = v[i]
-            u2 = u[i + 1]
-            v2 = v[i + 1]
-            
-            # Compute mean wind in the layer
-            um = (u1 + u2) / 2
-            vm = (v1 + v2) / 2
-            
-            # Compute storm-relative wind
-            ur = um - storm_motion_ms[0]
-            vr = vm - storm_motion_ms[1]
-            
-            # Compute shear vector between the levels
-            du = u2 - u1
-            dv = v2 - v1
-            
-            # Compute height difference
-            dz = z2 - z1
-            
-            # Compute layer SRH using the 2D cross product
-            srh_layer = (ur * dv - vr * du)
-            
-            # Add layer SRH contribution to total
-            total_srh += srh_layer
-            
-        return total_srh
+        # cumsum accumulates in profile order, matching a level-by-level running total
+        return np.cumsum(np.where(inside, srh_layer, 0.0), axis=1)[:, -1]
         
     except Exception as e:
         print(f"Error in SRH calculation: {e}")
-        return np.nan
+        return np.full(hghts.shape, np.nan)
 
 
 def compute_bunkers(data):
@@ -10,6 +10,7 @@ let metarMarkers = [];
 let warningLayers = [];
 let vadDataLoaded = false;
 let currentTab = 'map';
+let hodographImageUrl = null;
 
 // Initialize the application
 document.addEventListener('DOMContentLoaded', function() {
@@ -506,6 +507,18 @@ async function generateCompleteAnalysis() {
     try {
         showLoading('Loading VAD data and generating analysis...');
         
+        // The METAR lookup does not depend on the VAD data, so start it now and
+        // let both requests travel together instead of one after the other
+        const metarStation = document.getElementById('metarStation').value.trim().toUpperCase();
+        const metarRequest = metarStation
+            ? fetch(`/api/metar/${metarStation}`)
+                .then(response => response.json())
+                .catch(() => {
+                    console.log('METAR data not available or invalid station');
+                    return null;
+                })
+            : Promise.resolve(null);
+        
         // Step 1: Load VAD data
         const vadResponse = await fetch(`/api/vad-data/${selectedSite.id}`);
         const vadData = await vadResponse.json();
@@ -518,23 +531,14 @@ async function generateCompleteAnalysis() {
         
         showMessage(`VAD data loaded: ${vadData.data_points} points`, 'info');
         
-        // Step 2: Load METAR data if station provided
+        // Step 2: Use METAR data if station provided
         let metarInfo = '';
-        const metarStation = document.getElementById('metarStation').value.trim().toUpperCase();
-        if (metarStation) {
-            try {
-                const metarResponse = await fetch(`/api/metar/${metarStation}`);
-                const metarResult = await metarResponse.json();
-                
-                if (!metarResult.error) {
-                    metarData = metarResult;
-                    metarData.station_id = metarStation; // Add station ID to metarData
-                    metarInfo = `METAR: ${metarResult.speed}kts @ ${metarResult.direction}°`;
-                    showMessage(`METAR data loaded: ${metarResult.speed}kts @ ${metarResult.direction}°`, 'info');
-                }
-            } catch (error) {
-                console.log('METAR data not available or invalid station');
-            }
+        const metarResult = await metarRequest;
+        if (metarResult && !metarResult.error) {
+            metarData = metarResult;
+            metarData.station_id = metarStation; // Add station ID to metarData
+            metarInfo = `METAR: ${metarResult.speed}kts @ ${metarResult.direction}°`;
+            showMessage(`METAR data loaded: ${metarResult.speed}kts @ ${metarResult.direction}°`, 'info');
         }
         
         // Step 3: Get storm motion if provided
@@ -566,17 +570,29 @@ async function generateCompleteAnalysis() {
             params.append('metar_direction', metarData.direction);
             params.append('metar_speed', metarData.speed);
             params.append('metar_station', metarData.station_id);
+            if (metarData.time) {
+                params.append('metar_time', metarData.time);
+            }
         }
         
-        const hodographResponse = await fetch(`/api/hodograph?${params}`);
-        const hodographData = await hodographResponse.json();
+        const hodographResponse = await fetch(`/api/hodograph?${params}`, {
+            headers: { 'Accept': 'image/webp,image/png' }
+        });
         
-        if (hodographData.error) {
-            showMessage('Hodograph Error: ' + hodographData.error, 'error');
+        if (!hodographResponse.ok) {
+            const hodographError = await hodographResponse.json();
+            showMessage('Hodograph Error: ' + hodographError.error, 'error');
         } else {
+            // The endpoint returns raw image bytes (WebP or PNG); display them through an object URL
+            const hodographBlob = await hodographResponse.blob();
+            if (hodographImageUrl) {
+                URL.revokeObjectURL(hodographImageUrl);
+            }
+            hodographImageUrl = URL.createObjectURL(hodographBlob);
+            
             // Display hodograph image in the new tab
             document.getElementById('hodographDisplay').innerHTML = `
-                <img src="data:image/png;base64,${hodographData.image}" alt="Hodograph" />
+                <img src="${hodographImageUrl}" alt="Hodograph" />
             `;
             
             // Clear parameters display - parameters are shown on the plot
@@ -1,3 +1,4 @@
+import math
 import numpy as np
 from typing import Tuple, List, Optional
 
@@ -37,7 +38,7 @@ def calculate_skoff_angle(surface_speed: float, surface_dir: float,
 
     # Calculate the angle between vectors using dot product
     dot_product = u1*u2 + v1*v2
-    magnitudes = np.sqrt((u1**2 + v1**2) * (u2**2 + v2**2))
+    magnitudes = np.hypot(u1, v1) * np.hypot(u2, v2)
 
     if magnitudes == 0:
         return 0.0
@@ -46,6 +47,22 @@ def calculate_skoff_angle(surface_speed: float, surface_dir: float,
     angle_rad = np.arccos(cos_angle)
     return np.rad2deg(angle_rad)
 
+def angle_between(u1: float, v1: float, u2: float, v2: float) -> Optional[float]:
+    """
+    Calculate the angle between two vectors given by their components.
+
+    Uses scalar math rather than NumPy since it is called with single values.
+
+    Returns:
+        Angle in degrees, or None if either vector has zero length
+    """
+    mag1 = math.hypot(u1, v1)
+    mag2 = math.hypot(u2, v2)
+    if mag1 == 0 or mag2 == 0:
+        return None
+    cos_angle = (u1 * u2 + v1 * v2) / (mag1 * mag2)
+    return math.degrees(math.acos(max(-1.0, min(1.0, cos_angle))))
+
 def validate_wind_data(speeds: List[float], directions: List[float], heights: List[float]) -> bool:
     """
     Validate wind data inputs.
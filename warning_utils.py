@@ -1,7 +1,7 @@
 """
 Utilities for fetching and processing NWS weather warnings data.
 """
-import requests
+from http_client import http_session
 import pandas as pd
 import json
 import re
@@ -17,7 +17,18 @@ NWS_USER_AGENT = "(Hodograph Analysis Tool, contact@example.com)"
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def fetch_active_warnings() -> List[Dict[str, Any]]:
     """
-    Fetch active severe thunderstorm and tornado warnings from NWS API.
+    Fetch active severe thunderstorm and tornado warnings from NWS API,
+    cached for the Streamlit map.
+    
+    Returns:
+        List of dictionaries containing warning data
+    """
+    return load_active_warnings()
+
+def load_active_warnings() -> List[Dict[str, Any]]:
+    """
+    Fetch active severe thunderstorm and tornado warnings from NWS API without
+    caching, for callers that manage their own cache lifetime.
     
     Returns:
         List of dictionaries containing warning data
@@ -29,10 +40,11 @@ def fetch_active_warnings() -> List[Dict[str, Any]]:
     
     try:
         # Fetch active alerts
-        response = requests.get(
+        response = http_session.get(
             f"{NWS_API_BASE}/alerts/active", 
             headers=headers,
-            params={"event": "Tornado Warning,Severe Thunderstorm Warning"}
+            params={"event": "Tornado Warning,Severe Thunderstorm Warning"},
+            timeout=10
         )
         response.raise_for_status()
         
@@ -205,9 +205,13 @@ _radar_info = {
     'TSJU': {'wfo': 'TJSJ', 'region': 2},
 }
 
-def build_has_name(radar_id, scan_time):
-    radar_info = _radar_info[radar_id]
+# File name prefix for each radar, formatted once at import. Lowercase ids map to
+# the same string so callers need not normalize case on every lookup.
+_has_prefix = dict(
+    (radar_id, "%s_SDUS3%d_NVW%s_" % (radar_info['wfo'], radar_info['region'], radar_id[1:]))
+    for radar_id, radar_info in _radar_info.items()
+)
+_has_prefix.update(dict((radar_id.lower(), prefix) for radar_id, prefix in list(_has_prefix.items())))
 
-    iname = "%s_SDUS3%d_NVW%s_%s" % (radar_info['wfo'], radar_info['region'], radar_id[1:], 
-                                     scan_time.strftime("%Y%m%d%H%M"))
-    return iname
\ No newline at end of file
+def build_has_name(radar_id, scan_time):
+    return _has_prefix[radar_id] + scan_time.strftime("%Y%m%d%H%M")
\ No newline at end of file